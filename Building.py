@@ -0,0 +1,92 @@
+from Employee import Employee
+from Event import Event
+from Room import Room
+from datetime import datetime
+
+
+class Building:
+    """
+    * Building class - Describes the static layout of a building (offices, meeting rooms,
+    * employees, PMFs and opening hours) and builds fresh Room and Employee objects from it.
+    * A Building holds no schedules, so it can be pickled cheaply and sent to worker processes.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, number_of_offices, number_of_meeting_rooms, number_of_employees,
+                 meeting_durations_pmf, number_of_employees_pmf, number_of_meetings_pmf,
+                 room_use=(datetime(2010, 1, 1, 8, 0, 0), datetime(2010, 1, 1, 17, 0, 0)),
+                 shifts=((datetime(2010, 1, 1, 8, 0, 0), datetime(2010, 1, 1, 12, 0, 0)),
+                         (datetime(2010, 1, 1, 13, 0, 0), datetime(2010, 1, 1, 17, 0, 0))),
+                 office_area=2.34520787991, meeting_room_area=2.34520787991 * 5, room_height=2, room_cost=0.1,
+                 max_office_occupancy=1, max_meeting_occupancy=5):
+        """
+        * Constructor for objects of class Building, the defaults match the building in Occupancy_Generator.ipynb
+        *
+        * @param  number_of_offices  the number of offices
+        * @param  number_of_meeting_rooms  the number of meeting rooms
+        * @param  number_of_employees  the number of employees, assigned to the offices in turn
+        * @param  meeting_durations_pmf  PMF of meeting durations in minutes
+        * @param  number_of_employees_pmf  PMF of the number of employees in a meeting
+        * @param  number_of_meetings_pmf  PMF of the number of meetings in a room per day
+        * @param  room_use  (start, end) datetimes during which the rooms can be used
+        * @param  shifts  list of (start, end) datetimes making up each employee's working schedule
+        * @param  office_area  area of each office
+        * @param  meeting_room_area  area of each meeting room
+        * @param  room_height  height of every room
+        * @param  room_cost  room cost per unit area
+        * @param  max_office_occupancy  the number of employees each office holds
+        * @param  max_meeting_occupancy  the number of people each meeting room holds
+        """
+        self.number_of_offices = number_of_offices
+        self.number_of_meeting_rooms = number_of_meeting_rooms
+        self.number_of_employees = number_of_employees
+        self.meeting_durations_pmf = meeting_durations_pmf
+        self.number_of_employees_pmf = number_of_employees_pmf
+        self.number_of_meetings_pmf = number_of_meetings_pmf
+        self.room_use = room_use
+        self.shifts = shifts
+        self.office_area = office_area
+        self.meeting_room_area = meeting_room_area
+        self.room_height = room_height
+        self.room_cost = room_cost
+        self.max_office_occupancy = max_office_occupancy
+        self.max_meeting_occupancy = max_meeting_occupancy
+
+    def build(self):
+        """
+        * Creates the rooms and employees of the building with empty event schedules
+        *
+        * @return    (office_rooms_list, meeting_rooms_list, employees_list)
+        """
+        room_use = Event(self.room_use[0], self.room_use[1], "Room is available for use", None, None)
+
+        office_rooms_list = []
+        for office_number in range(self.number_of_offices):
+            office = Room("Office", "00" + str(office_number), self.office_area, self.room_height, self.room_cost,
+                          0, self.max_office_occupancy, self.meeting_durations_pmf, self.number_of_employees_pmf,
+                          self.number_of_meetings_pmf)
+            office.add_event_working(room_use)
+            office_rooms_list.append(office)
+
+        meeting_rooms_list = []
+        for meeting_room_number in range(self.number_of_meeting_rooms):
+            meeting_room = Room("Meeting room", "10" + str(meeting_room_number), self.meeting_room_area,
+                                self.room_height, self.room_cost, self.max_meeting_occupancy, 0,
+                                self.meeting_durations_pmf, self.number_of_employees_pmf,
+                                self.number_of_meetings_pmf)
+            meeting_room.add_event_working(room_use)
+            meeting_rooms_list.append(meeting_room)
+
+        shifts = [Event(start_time, end_time, "Shift " + str(i + 1), None, None)
+                  for i, (start_time, end_time) in enumerate(self.shifts)]
+        employees_list = []
+        for employee_number in range(self.number_of_employees):
+            employee = Employee("000" + str(employee_number), "Worker",
+                                office_rooms_list[employee_number % self.number_of_offices])
+            for shift in shifts:
+                employee.add_work_event(shift)
+            employees_list.append(employee)
+
+        return office_rooms_list, meeting_rooms_list, employees_list
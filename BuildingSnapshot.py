@@ -0,0 +1,192 @@
+from Employee import Employee
+from Event import Event
+from PMF import PMF
+from Room import Room
+from Schedule import Schedule
+import numpy as np
+
+SNAPSHOT_VERSION = 1  # Version of the snapshot layout, load() refuses files written with another version
+
+
+class BuildingSnapshot:
+    """
+    * BuildingSnapshot class - Flat, array-based copy of a static building model (rooms, employees,
+    * PMFs and working schedules) that is saved to and loaded from a compressed .npz file.
+    *
+    * Like Building it has a build() method returning fresh (office_rooms_list, meeting_rooms_list,
+    * employees_list), so it can be passed to SimulationRunner in place of a Building. Any hand-built
+    * list of rooms and employees can be captured, whatever their PMFs and working hours.
+    *
+    * PMFs and working events shared between rooms or employees are stored once, and the cumulative
+    * arrays of the PMF samplers are stored with them so they need not be recomputed. Event schedules
+    * are not stored, a snapshot describes the building before any day is simulated. The file holds
+    * only numeric and string arrays and is read without pickle.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, arrays):
+        """
+        * Constructor for objects of class BuildingSnapshot, use from_rooms, from_building or load
+        *
+        * @param  arrays  dictionary of the snapshot arrays
+        """
+        self.arrays = arrays
+
+    @classmethod
+    def from_rooms(cls, office_rooms_list, meeting_rooms_list, employees_list):
+        """
+        * Capture the static model of a building
+        *
+        * @param  office_rooms_list  list of office room objects
+        * @param  meeting_rooms_list  list of meeting room objects
+        * @param  employees_list  list of employee objects
+        * @return    new BuildingSnapshot object
+        """
+        rooms = office_rooms_list + meeting_rooms_list
+        pmf_indices, pmfs = {}, []
+        event_indices, events = {}, []
+
+        def pmf_index(pmf):
+            if pmf is None:
+                return -1
+            if id(pmf) not in pmf_indices:
+                pmf_indices[id(pmf)] = len(pmfs)
+                pmfs.append(pmf)
+            return pmf_indices[id(pmf)]
+
+        def working_events(schedules):
+            indices, offsets = [], [0]
+            for schedule in schedules:
+                for event in schedule.events:
+                    if id(event) not in event_indices:
+                        event_indices[id(event)] = len(events)
+                        events.append(event)
+                    indices.append(event_indices[id(event)])
+                offsets.append(len(indices))
+            return np.asarray(indices, dtype=np.int64), np.asarray(offsets, dtype=np.int64)
+
+        room_pmfs = np.array([[pmf_index(room.meeting_durations_in_minutes),
+                               pmf_index(room.number_of_employees_in_event),
+                               pmf_index(room.number_of_meetings_in_room_pmf)] for room in rooms],
+                             dtype=np.int64).reshape(len(rooms), 3)
+        room_working, room_working_offsets = working_events(room.working_schedule for room in rooms)
+        employee_working, employee_working_offsets = working_events(
+            employee.working_schedule for employee in employees_list)
+        room_indices = {id(room): index for index, room in enumerate(rooms)}
+
+        pmf_offsets = np.cumsum([0] + [len(pmf.probabilities) for pmf in pmfs])
+        arrays = {
+            'version': np.array(SNAPSHOT_VERSION),
+            'number_of_offices': np.array(len(office_rooms_list)),
+            'pmf_values': np.array([value for pmf in pmfs for value in pmf.values[:len(pmf.probabilities)]]),
+            'pmf_probabilities': np.array([p for pmf in pmfs for p in pmf.probabilities], dtype=float),
+            'pmf_offsets': pmf_offsets.astype(np.int64),
+            'pmf_cumulative': np.concatenate([pmf.sampler()[0] for pmf in pmfs]) if pmfs else np.zeros(0),
+            'pmf_cumulative_offsets': np.cumsum([0] + [len(pmf.sampler()[0]) for pmf in pmfs]).astype(np.int64),
+            'event_start': np.array([event.start_minute for event in events], dtype=np.int64),
+            'event_end': np.array([event.end_minute for event in events], dtype=np.int64),
+            'event_type': np.array([str(event.event_type) for event in events], dtype=str),
+            'room_type': np.array([str(room.room_type) for room in rooms], dtype=str),
+            'room_name': np.array([str(room.room_name) for room in rooms], dtype=str),
+            'room_area': np.array([room.area for room in rooms], dtype=float),
+            'room_height': np.array([room.room_height for room in rooms], dtype=float),
+            'room_cost_per_area': np.array([room.room_cost_per_area for room in rooms], dtype=float),
+            'room_max_meeting_occupancy': np.array([room.max_meeting_occupancy for room in rooms], dtype=np.int64),
+            'room_max_office_occupancy': np.array([room.max_office_occupancy for room in rooms], dtype=np.int64),
+            'room_pmfs': room_pmfs,
+            'room_working': room_working,
+            'room_working_offsets': room_working_offsets,
+            'employee_id': np.array([str(employee.employee_id) for employee in employees_list], dtype=str),
+            'employee_role': np.array([str(employee.role) for employee in employees_list], dtype=str),
+            'employee_office': np.array([room_indices.get(id(employee.assigned_office), -1)
+                                         for employee in employees_list], dtype=np.int64),
+            'employee_working': employee_working,
+            'employee_working_offsets': employee_working_offsets,
+        }
+        return cls(arrays)
+
+    @classmethod
+    def from_building(cls, building):
+        """
+        * Capture the model described by a Building
+        *
+        * @param  building  the Building
+        * @return    new BuildingSnapshot object
+        """
+        return cls.from_rooms(*building.build())
+
+    def save(self, path):
+        """
+        * Write the snapshot to a compressed .npz file
+        *
+        * @param  path  the file path, numpy adds .npz if it is missing
+        """
+        np.savez_compressed(path, **self.arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        * Read a snapshot written by save
+        *
+        * @param  path  the file path
+        * @return    new BuildingSnapshot object
+        """
+        with np.load(path, allow_pickle=False) as file:
+            arrays = {name: file[name] for name in file.files}
+        if 'version' not in arrays or int(arrays['version']) != SNAPSHOT_VERSION:
+            raise ValueError("The building snapshot " + str(path) + " has version "
+                             + str(arrays.get('version')) + ", expected " + str(SNAPSHOT_VERSION) + ".")
+        return cls(arrays)
+
+    def build(self):
+        """
+        * Creates the rooms and employees of the building with empty event schedules
+        *
+        * @return    (office_rooms_list, meeting_rooms_list, employees_list)
+        """
+        arrays = self.arrays
+        pmf_offsets = arrays['pmf_offsets'].tolist()
+        values = arrays['pmf_values']
+        probabilities = arrays['pmf_probabilities'].tolist()
+        cumulative = arrays['pmf_cumulative']
+        cumulative_offsets = arrays['pmf_cumulative_offsets'].tolist()
+        pmfs = []
+        for index in range(len(pmf_offsets) - 1):
+            start, end = pmf_offsets[index], pmf_offsets[index + 1]
+            pmf = PMF(values[start:end].tolist(), probabilities[start:end])
+            # Restore the cached sampler instead of recomputing the cumulative mass function
+            pmf._sampler = (cumulative[cumulative_offsets[index]:cumulative_offsets[index + 1]], values[start:end])
+            pmfs.append(pmf)
+
+        events = [Event.from_minutes(start, end, event_type, None, None) for start, end, event_type in
+                  zip(arrays['event_start'].tolist(), arrays['event_end'].tolist(), arrays['event_type'].tolist())]
+
+        def working_schedules(indices, offsets):
+            indices, offsets = indices.tolist(), offsets.tolist()
+            return [Schedule([events[i] for i in indices[offsets[k]:offsets[k + 1]]]) for k in range(len(offsets) - 1)]
+
+        rooms = []
+        for (room_type, room_name, area, height, cost, max_meeting, max_office, room_pmfs,
+             working_schedule) in zip(arrays['room_type'].tolist(), arrays['room_name'].tolist(),
+                                      arrays['room_area'].tolist(), arrays['room_height'].tolist(),
+                                      arrays['room_cost_per_area'].tolist(),
+                                      arrays['room_max_meeting_occupancy'].tolist(),
+                                      arrays['room_max_office_occupancy'].tolist(), arrays['room_pmfs'].tolist(),
+                                      working_schedules(arrays['room_working'], arrays['room_working_offsets'])):
+            room = Room(room_type, room_name, area, height, cost, max_meeting, max_office,
+                        *[pmfs[i] if i >= 0 else None for i in room_pmfs])
+            room.working_schedule = working_schedule
+            rooms.append(room)
+
+        employees_list = []
+        for employee_id, role, office, working_schedule in zip(
+                arrays['employee_id'].tolist(), arrays['employee_role'].tolist(), arrays['employee_office'].tolist(),
+                working_schedules(arrays['employee_working'], arrays['employee_working_offsets'])):
+            employee = Employee(employee_id, role, rooms[office] if office >= 0 else None)
+            employee.working_schedule = working_schedule
+            employees_list.append(employee)
+
+        number_of_offices = int(arrays['number_of_offices'])
+        return rooms[:number_of_offices], rooms[number_of_offices:], employees_list
@@ -0,0 +1,119 @@
+from Event import Event
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Reasons a meeting could not be booked, also recorded with each cancelled meeting
+ROOM_CONFLICT = 'Time conflict'
+EMPLOYEE_CONFLICT = 'Employees conflict'
+
+
+class ConflictPolicy:
+    """
+    * ConflictPolicy class - Base class of the strategies ScheduleManager uses for a meeting it
+    * could not book after the maximum number of attempts, either because no new start time freed
+    * its room (ROOM_CONFLICT) or because an attendee stayed unavailable (EMPLOYEE_CONFLICT).
+    *
+    * Before resolve is called the manager releases the attendees already booked into the meeting.
+    * The meeting passed in may already have been moved by the manager's resampling, original_start
+    * is the start it was drafted with.
+    * resolve returns a replacement event, which the manager books in place of the meeting, or None
+    * to give the meeting up.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    # Book the meeting without an unavailable attendee instead of calling resolve
+    skip_unavailable_attendees = False
+    # Walk the events last to first, needed by policies that remove given up meetings from the building schedule
+    reverse_order = False
+
+    def resolve(self, manager, event_index, reason, start_of_day, work_hours_in_day, original_start):
+        """
+        * Handle a meeting that could not be booked
+        *
+        * @param  manager  the ScheduleManager booking the meeting
+        * @param  event_index  index of the meeting in the building schedule
+        * @param  reason  ROOM_CONFLICT or EMPLOYEE_CONFLICT
+        * @param  start_of_day  hour of the day the meeting start times are sampled from
+        * @param  work_hours_in_day  number of hours in the day a meeting can be scheduled in
+        * @param  original_start  start the meeting was drafted with, in minutes from midnight of DAY_ZERO
+        * @return    replacement Event free for its room and attendees, None to give the meeting up
+        """
+        raise NotImplementedError
+
+
+class DropPolicy(ConflictPolicy):
+    """
+    * Drop a meeting whose room stays unavailable and book meetings without their unavailable
+    * attendees. Nothing is recorded, this is the original behaviour of ScheduleManager.
+    """
+    skip_unavailable_attendees = True
+
+    def resolve(self, manager, event_index, reason, start_of_day, work_hours_in_day, original_start):
+        logger.debug("Event in meeting room %s can't be scheduled",
+                     manager.building_schedule.get_event(event_index).room.room_name)
+        return None
+
+
+class CancelPolicy(ConflictPolicy):
+    """
+    * Cancel the meeting and record it in the manager's cancelled meetings and per-room
+    * cancellation counts, the cancellation model of ScheduleManager_cancel.
+    """
+    reverse_order = True
+
+    def resolve(self, manager, event_index, reason, start_of_day, work_hours_in_day, original_start):
+        manager.cancel_event(event_index, reason)
+        return None
+
+
+class RescheduleLaterPolicy(CancelPolicy):
+    """
+    * Move the meeting to the earliest start time after its drafted start at which its room and
+    * all of its attendees are free, and cancel it if there is none.
+    """
+    def resolve(self, manager, event_index, reason, start_of_day, work_hours_in_day, original_start):
+        event = manager.building_schedule.get_event(event_index)
+        duration = event.duration_in_minutes()
+        for start_time in manager.feasible_start_times(start_of_day, work_hours_in_day, duration, event.room):
+            if start_time <= original_start:
+                continue
+            new_event = Event.from_minutes(start_time, start_time + duration, "Meeting", event.room,
+                                           list(event.employees))
+            if manager.attendees_are_free(new_event):
+                return new_event
+        return super().resolve(manager, event_index, reason, start_of_day, work_hours_in_day,
+                               original_start)
+
+
+class ShrinkPolicy(CancelPolicy):
+    """
+    * Move the meeting to the start time nearest its drafted start at which its room and all of
+    * its attendees are free, shortening it step by step when no such time exists at its full
+    * length, and cancel it once it would be shorter than the minimum duration.
+    """
+    def __init__(self, step=30, minimum_duration=30):
+        """
+        * Constructor for objects of class ShrinkPolicy
+        *
+        * @param  step  minutes taken off the meeting at each step
+        * @param  minimum_duration  shortest meeting in minutes that is kept
+        """
+        self.step = step
+        self.minimum_duration = minimum_duration
+
+    def resolve(self, manager, event_index, reason, start_of_day, work_hours_in_day, original_start):
+        event = manager.building_schedule.get_event(event_index)
+        duration = event.duration_in_minutes()
+        while duration >= self.minimum_duration:
+            start_times = manager.feasible_start_times(start_of_day, work_hours_in_day, duration, event.room)
+            for start_time in sorted(start_times, key=lambda start: abs(start - original_start)):
+                new_event = Event.from_minutes(start_time, start_time + duration, "Meeting", event.room,
+                                               list(event.employees))
+                if manager.attendees_are_free(new_event):
+                    return new_event
+            duration -= self.step
+        return super().resolve(manager, event_index, reason, start_of_day, work_hours_in_day,
+                               original_start)
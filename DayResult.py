@@ -0,0 +1,79 @@
+import numpy as np
+
+
+class DayResult:
+    """
+    * DayResult class - The structured result of one simulated day, kept in memory so
+    * that the statistics can be computed without writing and re-reading the CSV files.
+    *
+    * meetings is a table of the scheduled meetings held as a dictionary of equal length arrays:
+    *     Room - meeting room label, e.g. "Meeting room 100"
+    *     Start - start of the meeting in minutes after midnight
+    *     Duration - length of the meeting in minutes
+    *     Occupancy - the number of employees in the meeting
+    *     Day - index of the simulated day
+    *
+    * stats holds the exported SetupStats of the day when the manager collected them.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, day, grid, meetings, cancelled=None, experiment=None, seed=None, stats=None):
+        """
+        * Constructor for objects of class DayResult
+        *
+        * @param  day  index of the simulated day
+        * @param  grid  OccupancyGrid of the day
+        * @param  meetings  dictionary of the meeting table columns
+        * @param  cancelled  list of cancelled meeting records, empty if the manager does not cancel meetings
+        * @param  experiment  index of the experiment the day belongs to, if any
+        * @param  seed  seed the day was simulated with, if known
+        * @param  stats  dictionary of the day's SetupStats, None if they were not collected
+        """
+        self.day = day
+        self.grid = grid
+        self.meetings = meetings
+        self.cancelled = [] if cancelled is None else cancelled
+        self.experiment = experiment
+        self.seed = seed
+        self.stats = stats
+
+    @classmethod
+    def from_rooms(cls, day, grid, meeting_rooms_list, cancelled=None, stats=None):
+        """
+        * Build the result of a day from the meeting events in the meeting room schedules
+        *
+        * @param  day  index of the simulated day
+        * @param  grid  OccupancyGrid of the day
+        * @param  meeting_rooms_list  list of meeting room objects
+        * @param  cancelled  list of cancelled meeting records
+        * @param  stats  dictionary of the day's SetupStats
+        * @return    new DayResult object
+        """
+        rooms, start_minutes, end_minutes, head_counts = [], [], [], []
+        for meeting_room in meeting_rooms_list:
+            room_label = "Meeting room " + str(meeting_room.room_name)
+            for event in meeting_room.events_schedule.events:
+                if event.event_type == "Meeting":
+                    rooms.append(room_label)
+                    start_minutes.append(event.start_minute)
+                    end_minutes.append(event.end_minute)
+                    head_counts.append(len(event.employees))
+        start_minutes = np.asarray(start_minutes, dtype=int)
+        meetings = {
+            'Room': np.asarray(rooms, dtype=object),
+            'Start': start_minutes % (24 * 60),
+            'Duration': np.asarray(end_minutes, dtype=int) - start_minutes,
+            'Occupancy': np.asarray(head_counts, dtype=int),
+            'Day': np.full(len(rooms), day, dtype=int),
+        }
+        return cls(day, grid, meetings, cancelled, stats=stats)
+
+    def number_of_meetings(self):
+        """
+        * Gets the number of scheduled meetings
+        *
+        * @return    the number of meetings
+        """
+        return len(self.meetings['Room'])
@@ -1,11 +1,25 @@
+from datetime import datetime
+from datetime import timedelta
+
+DAY_ZERO = datetime(2010, 1, 1)   # Midnight of the simulated day, event times are stored as minutes from here
+ONE_MINUTE = timedelta(minutes=1)
+
+
 class Event:
     """
     * Event class stores the start time, end time and the meeting type
     *
+    * Start and end times are held as integer minutes from midnight of DAY_ZERO, the
+    * simulated day, which keeps every event small and makes the overlap and containment
+    * tests integer comparisons. start_time and end_time give datetime views on demand,
+    * and datetimes assigned to them are stored to the minute.
+    *
     * @author Dr. James Andrews
     * @version 0.1.0
     * @date 20/01/2023
     """
+    __slots__ = ('start_minute', 'end_minute', 'event_type', 'room', 'employees')
+
     def __init__(self, start_time_datetime, end_time_datetime, event_type_string, event_room, event_employees):
         self.start_time = start_time_datetime   # Start date and time of the event
         self.end_time = end_time_datetime       # End date and time of the event
@@ -13,13 +27,68 @@ class Event:
         self.room = event_room                  # Event room
         self.employees = event_employees        # Employees in the event
 
+    @classmethod
+    def from_minutes(cls, start_minute, end_minute, event_type_string, event_room, event_employees):
+        """
+        * Creates an event directly from integer minutes without building datetimes
+        *
+        * @param  start_minute  start of the event in minutes from midnight of DAY_ZERO
+        * @param  end_minute  end of the event in minutes from midnight of DAY_ZERO
+        * @return    the new event
+        """
+        event = cls.__new__(cls)
+        event.start_minute = start_minute
+        event.end_minute = end_minute
+        event.event_type = event_type_string
+        event.room = event_room
+        event.employees = event_employees
+        return event
+
+    @property
+    def start_time(self):
+        """
+        * Start date and time of the event
+        """
+        return DAY_ZERO + timedelta(minutes=self.start_minute)
+
+    @start_time.setter
+    def start_time(self, start_time_datetime):
+        self.start_minute = (start_time_datetime - DAY_ZERO) // ONE_MINUTE
+
+    @property
+    def end_time(self):
+        """
+        * End date and time of the event
+        """
+        return DAY_ZERO + timedelta(minutes=self.end_minute)
+
+    @end_time.setter
+    def end_time(self, end_time_datetime):
+        self.end_minute = (end_time_datetime - DAY_ZERO) // ONE_MINUTE
+
     def duration(self):
         """
         * Determines the duration of the event
         *
         * @return    duration of the event
         """
-        return self.end_time - self.start_time
+        return timedelta(minutes=self.end_minute - self.start_minute)
+
+    def duration_in_minutes(self):
+        """
+        * Determines the duration of the event in minutes
+        *
+        * @return    duration of the event in minutes
+        """
+        return self.end_minute - self.start_minute
+
+    def minutes_mask(self):
+        """
+        * Bitmap of the minutes the event covers, bit m is set for minute m from midnight of DAY_ZERO
+        *
+        * @return    the bitmap as an integer
+        """
+        return ((1 << (self.end_minute - self.start_minute)) - 1) << self.start_minute
 
     def is_overlap(self, event):
         """
@@ -28,7 +97,7 @@ class Event:
         * @param  event  the event
         * @return    true if the event e overlaps with this event and false otherwise
         """
-        return (self.start_time < event.end_time) & (event.start_time < self.end_time)
+        return self.start_minute < event.end_minute and event.start_minute < self.end_minute
 
     def is_contained(self, event):
         """
@@ -37,7 +106,7 @@ class Event:
         * @param  event  the event
         * @return    true if the event is entirely contained within this event and false otherwise
         """
-        return not(self.start_time > event.start_time) and not(self.end_time < event.end_time)
+        return self.start_minute <= event.start_minute and self.end_minute >= event.end_minute
 
     def is_before(self, event):
         """
@@ -45,7 +114,7 @@ class Event:
         * @param event:
         * @return:    true if the event is before this event and false otherwise
         """
-        return self.start_time < event.start_time
+        return self.start_minute < event.start_minute
 
     def is_after(self, event):
         """
@@ -54,7 +123,7 @@ class Event:
         * @param event:
         * @return:      true if the event starts after this event and false otherwise
         """
-        return self.start_time > event.start_time
+        return self.start_minute > event.start_minute
 
     def print(self):
         """
@@ -0,0 +1,95 @@
+from Event import DAY_ZERO
+from datetime import timedelta
+import numpy as np
+
+
+class OccupancyGrid:
+    """
+    * OccupancyGrid class - Rasterises the room schedules onto a fixed time grid
+    *
+    * Each row of the occupied and occupancy matrices is a room (offices first, then
+    * meeting rooms) and each column is a timestep. A room is occupied at a timestep
+    * if one of its events starts at or before the timestep and ends at least one
+    * second after it, which is the test the CSV writers used to make with a probe Event.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, office_rooms_list, meeting_rooms_list, time_start, timestep, number_of_timesteps):
+        """
+        * Constructor for objects of class OccupancyGrid
+        *
+        * @param  office_rooms_list  list of office room objects
+        * @param  meeting_rooms_list  list of meeting room objects
+        * @param  time_start  datetime of the first timestep
+        * @param  timestep  timedelta between timesteps
+        * @param  number_of_timesteps  the number of timesteps in the grid
+        """
+        rooms = office_rooms_list + meeting_rooms_list
+        self.time_start = time_start
+        self.timestep = timestep
+        self.number_of_timesteps = number_of_timesteps
+        self.room_types = ['Office'] * len(office_rooms_list) + ['Meeting room'] * len(meeting_rooms_list)
+        self.room_names = [str(room.room_name) for room in rooms]
+        self.max_occupancy = np.array([room.max_office_occupancy for room in office_rooms_list]
+                                      + [room.max_meeting_occupancy for room in meeting_rooms_list], dtype=int)
+        self.area = np.array([room.area for room in rooms], dtype=float)
+        self.occupied, self.occupancy = self.rasterise(rooms)
+
+    def rasterise(self, rooms):
+        """
+        * Builds the occupied and occupancy matrices in one pass over the room events.
+        * Every event is turned into the first and last timestep it covers, and the
+        * matrices are recovered from the cumulative sum of the +1/-1 steps at those indices.
+        *
+        * @param  rooms  list of room objects, one per row of the grid
+        * @return    (occupied, occupancy) - boolean and integer arrays of shape (rooms, timesteps)
+        """
+        rows, start_minutes, end_minutes, head_counts = [], [], [], []
+        for row, room in enumerate(rooms):
+            for event in room.events_schedule.events:
+                rows.append(row)
+                start_minutes.append(event.start_minute)
+                end_minutes.append(event.end_minute)
+                head_counts.append(0 if event.employees is None else len(event.employees))
+
+        # Work in seconds from the first timestep so that sub-minute timesteps are also exact
+        one_second = timedelta(seconds=1)
+        time_start = (self.time_start - DAY_ZERO) // one_second
+        timestep = self.timestep // one_second
+        rows = np.asarray(rows, dtype=int)
+        head_counts = np.asarray(head_counts, dtype=int)
+        first_steps = -((time_start - 60 * np.asarray(start_minutes, dtype=int)) // timestep)
+        last_steps = (60 * np.asarray(end_minutes, dtype=int) - 1 - time_start) // timestep
+        first_steps = np.maximum(first_steps, 0)
+        last_steps = np.minimum(last_steps, self.number_of_timesteps - 1)
+
+        event_steps = np.zeros((len(rooms), self.number_of_timesteps + 1), dtype=int)
+        head_count_steps = np.zeros((len(rooms), self.number_of_timesteps + 1), dtype=int)
+        covered = first_steps <= last_steps
+        rows, first_steps, last_steps, head_counts = (rows[covered], first_steps[covered],
+                                                      last_steps[covered], head_counts[covered])
+        np.add.at(event_steps, (rows, first_steps), 1)
+        np.add.at(event_steps, (rows, last_steps + 1), -1)
+        np.add.at(head_count_steps, (rows, first_steps), head_counts)
+        np.add.at(head_count_steps, (rows, last_steps + 1), -head_counts)
+        occupied = np.cumsum(event_steps, axis=1)[:, :-1] > 0
+        occupancy = np.cumsum(head_count_steps, axis=1)[:, :-1]
+        return occupied, occupancy
+
+    def room_labels(self):
+        """
+        * Gets the label of each room, e.g. "Office 001" or "Meeting room 100"
+        *
+        * @return    list of room labels in row order
+        """
+        return [room_type + " " + room_name for room_type, room_name in zip(self.room_types, self.room_names)]
+
+    def time_labels(self):
+        """
+        * Gets the time of each timestep in HH:MM format
+        *
+        * @return    list of time labels in column order
+        """
+        return [(self.time_start + i * self.timestep).strftime("%H:%M") for i in range(self.number_of_timesteps)]
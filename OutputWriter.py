@@ -0,0 +1,151 @@
+import numpy as np
+import csv
+import gzip
+import json
+
+
+class OutputWriter:
+    """
+    * OutputWriter class - Base class of the output backends used by the schedule managers.
+    * It lays an OccupancyGrid out as the two output tables, subclasses store them.
+    *
+    * Inference table, one row per (time, room) observation:
+    *     Room, Time, Occupied, Occupancy, Max_occupancy
+    * Optimisation table, one row per time and one column per room holding its head-count,
+    * together with the maximum occupancy and the cost of each room.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def inference_table(self, grid):
+        """
+        * Lay out the inference table, rows are ordered by time and then by room
+        *
+        * @param  grid  the OccupancyGrid to lay out
+        * @return    dictionary mapping each column name to a NumPy array
+        """
+        number_of_rooms = len(grid.room_names)
+        return {
+            'Room': np.tile(np.array(grid.room_labels()), grid.number_of_timesteps),
+            'Time': np.repeat(np.array(grid.time_labels()), number_of_rooms),
+            'Occupied': grid.occupied.T.ravel().astype(np.int8),
+            'Occupancy': grid.occupancy.T.ravel(),
+            'Max_occupancy': np.tile(grid.max_occupancy, grid.number_of_timesteps),
+        }
+
+    def optimization_table(self, grid):
+        """
+        * Lay out the optimisation table
+        *
+        * @param  grid  the OccupancyGrid to lay out
+        * @return    dictionary with the 'Time' labels, the 'Room' labels, the 'Occupancy' matrix
+        *            (timesteps x rooms), and the 'Max_occupancy' and 'Room_cost' of each room
+        """
+        return {
+            'Time': np.array(grid.time_labels()),
+            'Room': np.array(grid.room_labels()),
+            'Occupancy': grid.occupancy.T,
+            'Max_occupancy': grid.max_occupancy,
+            'Room_cost': 95.39 * grid.area,
+        }
+
+    def write_inference(self, filename, grid):
+        """
+        * Write the inference table
+        *
+        * @param  filename  the output path
+        * @param  grid  the OccupancyGrid to write
+        """
+        raise NotImplementedError
+
+    def write_optimization(self, filename, grid):
+        """
+        * Write the optimisation table
+        *
+        * @param  filename  the output path
+        * @param  grid  the OccupancyGrid to write
+        """
+        raise NotImplementedError
+
+
+class CsvWriter(OutputWriter):
+    """
+    * CsvWriter class - Writes the tables as plain CSV files, the original output format
+    """
+    def open(self, filename):
+        """
+        * Open a file for writing CSV text
+        *
+        * @param  filename  the output path
+        * @return    the open text file
+        """
+        return open(filename, 'w', newline='')
+
+    def write_inference(self, filename, grid):
+        table = self.inference_table(grid)
+        with self.open(filename) as file:
+            writer = csv.writer(file)
+            writer.writerow(list(table))
+            writer.writerows(zip(*(column.tolist() for column in table.values())))
+
+    def write_optimization(self, filename, grid):
+        table = self.optimization_table(grid)
+        with self.open(filename) as file:
+            writer = csv.writer(file)
+            writer.writerow(['Time'] + grid.room_types)
+            writer.writerows([time_label] + occupancy_list
+                             for time_label, occupancy_list in zip(table['Time'].tolist(), table['Occupancy'].tolist()))
+            writer.writerow(['Maximum occupancy'] + table['Max_occupancy'].tolist())
+            writer.writerow(['Room cost'] + table['Room_cost'].tolist())
+
+
+class GzipCsvWriter(CsvWriter):
+    """
+    * GzipCsvWriter class - Writes the same CSV files as CsvWriter, gzip compressed
+    * (pandas.read_csv reads them directly)
+    """
+    def open(self, filename):
+        return gzip.open(filename, 'wt', newline='')
+
+
+class NpzWriter(OutputWriter):
+    """
+    * NpzWriter class - Writes each table as a compressed NumPy .npz archive with one
+    * array per column, loaded back in a single numpy.load call
+    """
+    def write_inference(self, filename, grid):
+        np.savez_compressed(filename, **self.inference_table(grid))
+
+    def write_optimization(self, filename, grid):
+        np.savez_compressed(filename, **self.optimization_table(grid))
+
+
+class ParquetWriter(OutputWriter):
+    """
+    * ParquetWriter class - Writes each table as a Parquet file, requires pyarrow.
+    * The optimisation table has a Time column and one column per room label, the
+    * maximum occupancy and room cost lists are stored in the file's schema metadata.
+    """
+    def __init__(self):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError("ParquetWriter requires pyarrow, install it with 'pip install pyarrow'") from error
+        self.pyarrow = pyarrow
+        self.parquet = pyarrow.parquet
+
+    def write_inference(self, filename, grid):
+        self.parquet.write_table(self.pyarrow.table(self.inference_table(grid)), filename)
+
+    def write_optimization(self, filename, grid):
+        table = self.optimization_table(grid)
+        columns = {'Time': table['Time']}
+        for room_label, occupancy in zip(table['Room'].tolist(), table['Occupancy'].T):
+            columns[room_label] = occupancy
+        parquet_table = self.pyarrow.table(columns).replace_schema_metadata({
+            'Max_occupancy': json.dumps(table['Max_occupancy'].tolist()),
+            'Room_cost': json.dumps(table['Room_cost'].tolist()),
+        })
+        self.parquet.write_table(parquet_table, filename)
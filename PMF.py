@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class PMF:
     """
      * Probability mass function class
@@ -15,6 +18,7 @@ class PMF:
         """
         self.values = values_list                # List of integer values
         self.probabilities = probabilities_list  # List of float values
+        self._sampler = None                     # Cached (cumulative, values) arrays used by sample()
 
     def get_values(self, index):
         """
@@ -38,6 +42,49 @@ class PMF:
             cmf_list.extend([cmf_list[i] + self.probabilities[i]])   # Calculate the cumulative
         return cmf_list
 
+    def sampler(self):
+        """
+        * Build (once) and return the cached sampler used by sample() and sample_n()
+        *
+        * The sampler holds the inner boundaries of the cumulative mass function, so a
+        * uniform draw u is mapped to its value with a single binary search. The
+        * mapping is identical to scanning the cmf returned by convert_pmf_values_to_cmf()
+        * for the last boundary that u is not below.
+        *
+        * @return  the (cumulative, values) pair of NumPy arrays
+        """
+        if self._sampler is None:
+            cumulative = np.cumsum(np.asarray(self.probabilities, dtype=float))[:-1]
+            values = np.asarray(self.values[:len(self.probabilities)])
+            self._sampler = (cumulative, values)
+        return self._sampler
+
+    def sample(self, rng):
+        """
+        * Sample a single value from the probability mass function
+        *
+        * @param  rng  the random number source, any object with a random() method
+        * @return  the sampled value
+        """
+        cumulative = self.sampler()[0]
+        index = int(np.searchsorted(cumulative, rng.random(), side='right'))
+        return self.values[index]
+
+    def sample_n(self, rng, n):
+        """
+        * Sample n values from the probability mass function in one batch
+        *
+        * @param  rng  the random number source, a numpy.random.Generator or any object with a random() method
+        * @param  n  the number of values to sample
+        * @return  NumPy array of the n sampled values
+        """
+        cumulative, values = self.sampler()
+        if isinstance(rng, np.random.Generator):
+            uniforms = rng.random(n)
+        else:
+            uniforms = np.fromiter((rng.random() for _ in range(n)), dtype=float, count=n)
+        return values[np.searchsorted(cumulative, uniforms, side='right')]
+
     def print_pmf(self):
         """
         * Print the information from the pmf
@@ -1,3 +1,6 @@
+from bisect import bisect_left, bisect_right
+
+
 class Schedule:
     """
     * Schedule stores the events and perform checks on event clashes
@@ -8,13 +11,18 @@ class Schedule:
     * @date 20/01/2023
     """
 
-    def __init__(self, events_list):
+    def __init__(self, events_list, indexed=True):
         """
         * Constructor for objects of class Schedule
         *
         @param  events_list  a list of all events in the schedule
+        @param  indexed  answer is_clash and is_contained from a sorted index instead of a linear scan
         """
         self.events = events_list
+        self.indexed = indexed
+        self._index = None  # (start times, running maximum of end times), built on the first query
+        self._mask = None   # (bitmap of the booked minutes, number of events it covers), built on request
+        self._is_sorted = all(not earlier.is_after(later) for earlier, later in zip(events_list, events_list[1:]))
 
     def get_number_of_events(self):
         """
@@ -47,7 +55,13 @@ class Schedule:
         *
         * @param  new_event  adds the new event to the schedule
         """
+        if self._is_sorted and self.events and self.events[-1].is_after(new_event):
+            self._is_sorted = False
         self.events.extend([new_event])
+        if self._index is not None:
+            self._insert_into_index(new_event)
+        if self._mask is not None:
+            self._mask = (self._mask[0] | new_event.minutes_mask(), self._mask[1] + 1)
 
     def remove_event(self, event):
         """
@@ -56,6 +70,17 @@ class Schedule:
         * @param  event  removes the event from the schedule
         """
         self.events.remove(event)
+        self._index = None
+        self._mask = None
+
+    def clear(self):
+        """
+        * Removes every event from the schedule
+        """
+        self.events = []
+        self._index = None
+        self._mask = None
+        self._is_sorted = True
 
     def replace_event(self, current_event, new_event):
         """
@@ -63,7 +88,13 @@ class Schedule:
         @param current_event:
         @param new_event:
         """
-        self.events[self.get_event_index(current_event)] = new_event
+        i = self.get_event_index(current_event)
+        self.events[i] = new_event
+        self._index = None
+        self._mask = None
+        if self._is_sorted and ((i > 0 and self.events[i - 1].is_after(new_event))
+                                or (i + 1 < len(self.events) and new_event.is_after(self.events[i + 1]))):
+            self._is_sorted = False
 
     def is_clash(self, other_event):
         """
@@ -72,6 +103,11 @@ class Schedule:
         * @param  other_event  checks if an event has a clash with existing events in the schedule
         * @return    true if there is an event clash and false if there is no event clash
         """
+        if self.indexed:
+            # Events starting before other_event ends overlap it if any of them ends after it starts
+            start_times, max_end_times = self._clash_index()
+            i = bisect_left(start_times, other_event.end_minute)
+            return i > 0 and max_end_times[i - 1] > other_event.start_minute
         for event in self.events:
             if event.is_overlap(other_event):
                 return True
@@ -85,11 +121,64 @@ class Schedule:
         * @return    true if the event is entirely contained within existing events in the schedule
         *                  and false otherwise
         """
+        if self.indexed:
+            # Events starting no later than other_event contain it if any of them ends no earlier
+            start_times, max_end_times = self._clash_index()
+            i = bisect_right(start_times, other_event.start_minute)
+            return i > 0 and max_end_times[i - 1] >= other_event.end_minute
         for event in self.events:
             if event.is_contained(other_event):
                 return True
         return False
 
+    def busy_mask(self):
+        """
+        * Gets the availability bitmap of the schedule, bit m is set if an event covers minute m.
+        * An event clashes with the schedule exactly when its own minutes_mask() shares a bit with it.
+        *
+        * @return    the bitmap as an integer
+        """
+        if self._mask is None or self._mask[1] != len(self.events):
+            mask = 0
+            for event in self.events:
+                mask |= event.minutes_mask()
+            self._mask = (mask, len(self.events))
+        return self._mask[0]
+
+    def _clash_index(self):
+        """
+        * Gets the sorted index used by is_clash and is_contained, rebuilding it if the
+        * events have changed since it was last built
+        *
+        * @return    the sorted start minutes and the running maximum of the end minutes in that order
+        """
+        if self._index is None or len(self._index[0]) != len(self.events):
+            start_times = []
+            max_end_times = []
+            for start_time, end_time in sorted((event.start_minute, event.end_minute) for event in self.events):
+                start_times.append(start_time)
+                if max_end_times and max_end_times[-1] > end_time:
+                    end_time = max_end_times[-1]
+                max_end_times.append(end_time)
+            self._index = (start_times, max_end_times)
+        return self._index
+
+    def _insert_into_index(self, new_event):
+        """
+        * Inserts an event into an existing sorted index without rebuilding it
+        *
+        * @param  new_event  the event that has just been added to the schedule
+        """
+        start_times, max_end_times = self._index
+        i = bisect_right(start_times, new_event.start_minute)
+        end_time = new_event.end_minute
+        start_times.insert(i, new_event.start_minute)
+        max_end_times.insert(i, end_time if i == 0 or max_end_times[i - 1] < end_time else max_end_times[i - 1])
+        for j in range(i + 1, len(max_end_times)):
+            if max_end_times[j] >= end_time:
+                break
+            max_end_times[j] = end_time
+
     def print(self):
         """
         *  Prints the details of the schedule
@@ -102,15 +191,43 @@ class Schedule:
     def sort(self):
         """
         *  Sort the schedule with the earliest event first
+        *
+        *  The schedule tracks whether add_event or replace_event have put an event out of
+        *  order, so sorting an already ordered schedule does nothing. Events with the same
+        *  start time keep the order in which they were added.
+        """
+        if not self._is_sorted:
+            self.events.sort(key=lambda event: event.start_minute)
+            self._is_sorted = True
+
+    def meetings(self):
+        """
+        *  Gets the meeting events in the schedule
+        *
+        *  @return    list of the events of type "Meeting", in schedule order
+        """
+        return [event for event in self.events if event.event_type == "Meeting"]
+
+    def number_of_meetings(self):
+        """
+        *  Gets the number of meetings in the schedule
+        *
+        *  @return    the number of events of type "Meeting"
+        """
+        return len(self.meetings())
+
+    def number_of_people_in_meetings(self):
+        """
+        *  Gets the number of people in each meeting
+        *
+        *  @return    list with the number of employees in each meeting, in schedule order
+        """
+        return [len(event.employees) for event in self.meetings()]
+
+    def duration_of_meetings(self):
+        """
+        *  Gets the duration of each meeting
+        *
+        *  @return    list of timedelta objects with the duration of each meeting, in schedule order
         """
-        sorted_events_list = []
-        number_of_events = self.get_number_of_events()
-        for i in range(number_of_events):
-            for j in range(self.get_number_of_events()):
-                if j == 0:
-                    earliest_event = self.events[j]
-                elif earliest_event.is_after(self.events[j]):
-                    earliest_event = self.events[j]
-            sorted_events_list.append(earliest_event)
-            self.events.remove(earliest_event)
-        self.events = sorted_events_list
+        return [event.duration() for event in self.meetings()]
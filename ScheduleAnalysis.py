@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+# Methods of the notebook's pmf (Type III) and pmf_4 (Type IV) functions, and the values each PMF always lists
+PMF_METHODS = ('Number_of_Meetings', 'Number_of_People', 'Duration')
+PMF_SUPPORTS = {'Number_of_Meetings': np.arange(0, 10), 'Number_of_People': np.arange(0, 10),
+                'Duration': np.arange(30, 301, 30)}
+
+
+def meeting_room_labels(number_of_meeting_rooms):
+    """
+    * Default meeting room labels, in the same format as the room labels of OccupancyGrid
+    *
+    * @param number_of_meeting_rooms: the number of meeting rooms
+    * @return: list of labels "Meeting room 100", "Meeting room 101", ...
+    """
+    return ['Meeting room ' + str(100 + k) for k in range(number_of_meeting_rooms)]
+
+
+def meeting_blocks(occupancy, room_labels=None, days=None, timestep_minutes=15):
+    """
+    * Extract the meeting blocks of many days and meeting rooms in one pass of
+    * run-length encoding.
+    *
+    * The occupancy of every (day, room) pair is laid end to end with a zero timestep
+    * between pairs, so a run can never cross from one day or room into the next, and
+    * the runs are found from the change points of the flattened array.
+    *
+    * @param occupancy: array of shape (days, timesteps, rooms) with the head-count of each meeting room
+    * @param room_labels: label of each room, "Meeting room {100+k}" if omitted
+    * @param days: day index of each slice of occupancy, 1..days if omitted
+    * @param timestep_minutes: minutes between timesteps, the duration of a block is this times its length
+    * @return: (schedule, schedule_4) DataFrames sorted by Day then Room, with the blocks of each room in time order
+    *          schedule - columns ['Room', 'Duration', 'Occupancy', 'Day'], a block is a run of
+    *                     timesteps with the same non-zero head-count (occupancy data, Type III)
+    *          schedule_4 - columns ['Room', 'Duration', 'Day'], a block is a run of occupied
+    *                       timesteps whatever the head-count (occupied data, Type IV)
+    """
+    occupancy = np.asarray(occupancy)
+    number_of_days, number_of_timesteps, number_of_rooms = occupancy.shape
+    if room_labels is None:
+        room_labels = meeting_room_labels(number_of_rooms)
+    if days is None:
+        days = np.arange(1, number_of_days + 1)
+    room_labels = np.asarray(room_labels, dtype=object)
+    days = np.asarray(days)
+
+    # Lay the rooms of each day end to end, each followed by a zero separator
+    padded = np.zeros((number_of_days, number_of_rooms, number_of_timesteps + 1), dtype=occupancy.dtype)
+    padded[:, :, :-1] = occupancy.transpose(0, 2, 1)
+    flat = padded.ravel()
+    previous = np.concatenate(([0], flat[:-1]))
+    following = np.concatenate((flat[1:], [0]))
+    segment = np.arange(flat.size) // (number_of_timesteps + 1)
+
+    def blocks(starts, ends):
+        start_positions = np.flatnonzero(starts)
+        end_positions = np.flatnonzero(ends)
+        segments = segment[start_positions]
+        return (start_positions, room_labels[segments % number_of_rooms],
+                timestep_minutes * (end_positions - start_positions + 1), days[segments // number_of_rooms])
+
+    occupied = flat != 0
+    start_positions, rooms, durations, block_days = blocks(occupied & (previous != flat),
+                                                           occupied & (following != flat))
+    schedule = pd.DataFrame({'Room': rooms, 'Duration': durations, 'Occupancy': flat[start_positions],
+                             'Day': block_days})
+    _, rooms, durations, block_days = blocks(occupied & (previous == 0), occupied & (following == 0))
+    schedule_4 = pd.DataFrame({'Room': rooms, 'Duration': durations, 'Day': block_days})
+
+    # Blocks come out ordered by day, room index and time, the stable sort keeps that order within a room
+    schedule = schedule.sort_values(['Day', 'Room'], kind='stable').reset_index(drop=True)
+    schedule_4 = schedule_4.sort_values(['Day', 'Room'], kind='stable').reset_index(drop=True)
+    return schedule, schedule_4
+
+
+def read_meeting_occupancy(file_path, n):
+    """
+    * Read the meeting room head-counts of the optimisation files office_Num1.csv ... office_Num{n}.csv
+    * into one array. Only the 'Meeting room' columns are parsed, and the footer rows
+    * (maximum occupancy and room cost) are dropped.
+    *
+    * @param file_path: directory holding the files, ending with a path separator as in the notebook
+    * @param n: the number of days to read
+    * @return: array of shape (days, timesteps, meeting rooms), shorter days are padded with zeros
+    """
+    days = []
+    for j in range(1, n + 1):
+        df = pd.read_csv(file_path + 'office_Num' + str(j) + '.csv',
+                         usecols=lambda column: column.startswith('Meeting room'))
+        days.append(df.to_numpy()[:-2])
+    if not days:
+        return np.zeros((0, 0, 0))
+    occupancy = np.zeros((len(days), max(len(day) for day in days), days[0].shape[1]), dtype=days[0].dtype)
+    for i, day in enumerate(days):
+        occupancy[i, :len(day)] = day
+    return occupancy
+
+
+def read_schedules(file_path, n, room_labels=None, timestep_minutes=15):
+    """
+    * Read n days of optimisation files and extract their meeting blocks,
+    * the batch replacement for the notebook's Schedule(filePath, n)
+    *
+    * @param file_path: directory holding office_Num{j}.csv for j = 1..n
+    * @param n: the number of days to read
+    * @param room_labels: label of each meeting room, "Meeting room {100+k}" if omitted
+    * @param timestep_minutes: minutes between the rows of the files
+    * @return: (schedule, schedule_4) as returned by meeting_blocks
+    """
+    return meeting_blocks(read_meeting_occupancy(file_path, n), room_labels, timestep_minutes=timestep_minutes)
+
+
+def meetings_table(results):
+    """
+    * Concatenate the meeting tables of simulated days
+    *
+    * @param results: list of DayResult objects, e.g. from SimulationRunner.run
+    * @return: DataFrame with columns ['Room', 'Start', 'Duration', 'Occupancy', 'Day'] sorted by Day, Room and Start
+    """
+    columns = ['Room', 'Start', 'Duration', 'Occupancy', 'Day']
+    meetings = pd.DataFrame({column: np.concatenate([result.meetings[column] for result in results])
+                             if results else [] for column in columns})
+    return meetings.sort_values(['Day', 'Room', 'Start'], kind='stable').reset_index(drop=True)
+
+
+def result_schedules(results):
+    """
+    * Build the meeting-block tables straight from simulated days, without the round-trip
+    * through the output files. Durations are the exact meeting lengths in minutes rather than
+    * multiples of the file timestep.
+    *
+    * @param results: list of DayResult objects
+    * @return: (schedule, schedule_4) with the columns returned by meeting_blocks
+    *          schedule - one block per meeting
+    *          schedule_4 - back to back meetings in a room merged into one occupied block
+    """
+    meetings = meetings_table(results)
+    schedule = meetings[['Room', 'Duration', 'Occupancy', 'Day']].copy()
+
+    rooms = meetings['Room'].to_numpy()
+    days = meetings['Day'].to_numpy()
+    starts = meetings['Start'].to_numpy()
+    ends = starts + meetings['Duration'].to_numpy()
+    # A block starts at every meeting that does not begin where the previous meeting in its room ended
+    new_block = np.ones(len(meetings), dtype=bool)
+    new_block[1:] = (rooms[1:] != rooms[:-1]) | (days[1:] != days[:-1]) | (starts[1:] != ends[:-1])
+    first = np.flatnonzero(new_block)
+    last = np.append(first[1:], len(meetings)) - 1
+    schedule_4 = pd.DataFrame({'Room': rooms[first], 'Duration': ends[last] - starts[first], 'Day': days[first]})
+    return schedule, schedule_4
+
+
+def pmf_table(schedule, days, methods=None, rooms=None):
+    """
+    * Estimate the PMFs of every meeting room, method and day horizon in one pass,
+    * the batch replacement for the notebook's pmf (Type III) and pmf_4 (Type IV).
+    *
+    * Each method's counts are binned once per (room, day, value) and summed cumulatively
+    * over Day, so the PMF of each horizon is a single slice of the cumulative counts.
+    * A PMF lists the default values of its method (0..9, or 30..300 minutes in steps of 30
+    * for Duration) and every other value observed within the horizon.
+    *
+    * @param schedule: schedule (Type III) or schedule_4 (Type IV) DataFrame from meeting_blocks
+    * @param days: a horizon or list of horizons, each PMF uses the days 1..horizon
+    * @param methods: methods to estimate, all of PMF_METHODS available in the schedule if omitted
+    *                 (Number_of_People needs the Occupancy column of a Type III schedule)
+    * @param rooms: rooms to estimate, every room in the schedule if omitted
+    * @return: DataFrame with columns ['Room', 'Method', 'Days', 'Value', 'Counts', 'Probability'],
+    *          ordered by method, room, horizon and value
+    """
+    if methods is None:
+        methods = [method for method in PMF_METHODS if method != 'Number_of_People' or 'Occupancy' in schedule]
+    for method in methods:
+        if method not in PMF_METHODS:
+            raise ValueError("The method should be one of 'Number_of_Meetings', 'Number_of_People', or 'Duration'.")
+        if method == 'Number_of_People' and 'Occupancy' not in schedule:
+            raise ValueError("The method 'Number_of_People' needs a schedule with an Occupancy column (Type III).")
+    all_rooms = np.unique(schedule['Room'].to_numpy(dtype=object))
+    rooms = all_rooms if rooms is None else np.asarray(rooms, dtype=object)
+    if not np.isin(rooms, all_rooms).all():
+        raise ValueError("The rooms should be in the schedule's Room column.")
+    number_of_days = int(schedule['Day'].max())
+    days = np.atleast_1d(np.asarray(days))
+    if not np.issubdtype(days.dtype, np.integer) or (days < 1).any() or (days > number_of_days).any():
+        raise ValueError("Days should be integers between 1 and the maximum of schedule['Day'] (" +
+                         str(number_of_days) + ").")
+
+    room_codes = pd.Index(rooms).get_indexer(schedule['Room'])
+    selected = room_codes >= 0
+    room_codes = room_codes[selected]
+    room_days = room_codes * number_of_days + schedule['Day'].to_numpy(dtype=int)[selected] - 1
+    number_of_rooms = len(rooms)
+
+    frames = []
+    for method in methods:
+        if method == 'Number_of_Meetings':
+            # Each day of each room is one observation of its number of meetings
+            observations = np.bincount(room_days, minlength=number_of_rooms * number_of_days)
+            values, value_codes = np.unique(observations, return_inverse=True)
+            bins = np.arange(number_of_rooms * number_of_days) * len(values) + value_codes
+        else:
+            column = 'Occupancy' if method == 'Number_of_People' else 'Duration'
+            values, value_codes = np.unique(schedule[column].to_numpy()[selected], return_inverse=True)
+            bins = room_days * len(values) + value_codes
+        counts = np.bincount(bins, minlength=number_of_rooms * number_of_days * len(values))
+        counts = counts.reshape(number_of_rooms, number_of_days, len(values)).cumsum(axis=1)[:, days - 1, :]
+
+        # Spread the counts over the observed values and the default values of the method
+        support = np.union1d(values, PMF_SUPPORTS[method])
+        support_counts = np.zeros(counts.shape[:2] + (len(support),), dtype=int)
+        support_counts[:, :, np.searchsorted(support, values)] = counts
+        totals = support_counts.sum(axis=2, keepdims=True)
+        probabilities = np.divide(support_counts, totals, out=np.zeros(support_counts.shape), where=totals > 0)
+
+        room_index, day_index, value_index = np.nonzero((support_counts > 0) | np.isin(support, PMF_SUPPORTS[method]))
+        frames.append(pd.DataFrame({'Room': rooms[room_index], 'Method': method, 'Days': days[day_index],
+                                    'Value': support[value_index],
+                                    'Counts': support_counts[room_index, day_index, value_index],
+                                    'Probability': probabilities[room_index, day_index, value_index]}))
+    return pd.concat(frames, ignore_index=True)
@@ -1,11 +1,23 @@
+from ConflictPolicy import DropPolicy, ROOM_CONFLICT, EMPLOYEE_CONFLICT
+from DayResult import DayResult
 from Event import Event
+from OccupancyGrid import OccupancyGrid
+from OutputWriter import CsvWriter
 from Schedule import Schedule
+from SetupStats import SetupStats
+from StatisticsSink import StatisticsSink
 from datetime import datetime
 from datetime import timedelta
-import random
+import logging
+import numpy as np
 import math
-import csv
-import matplotlib.pyplot as plt
+import os
+
+logger = logging.getLogger(__name__)
+
+# Statistics directory of managers that save statistics without a StatisticsSink, the Data/ folder next to
+# this module whatever the working directory
+DEFAULT_STATISTICS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Data')
 
 
 class ScheduleManager:
@@ -14,20 +26,46 @@ class ScheduleManager:
     * schedule of events (meetings, office occupancy etc.). It generates random
     * meetings according to probability mass functions (PMFs) attached to rooms,
     * assigns employees to meetings, prevents clashes with room and employee
-    * working schedules, and exports schedules to CSV.
+    * working schedules, and exports schedules to CSV. What happens to a meeting that
+    * cannot be booked is decided by its ConflictPolicy (drop, cancel, reschedule
+    * later or shrink).
     *
     * Author: Dr. James Andrews
     * Version: 0.1.0
     * Date: 04/10/2025
     """
-    def __init__(self, office_rooms_list_input, meeting_rooms_list_input, employees_list_input):
+    def __init__(self, office_rooms_list_input, meeting_rooms_list_input, employees_list_input, seed=None,
+                 constrained_sampling=False, writer=None, collect_stats=False, conflict_policy=None, statistics=None,
+                 timestep_minutes=15, start_granularity=30):
         """
         * Initialise the ScheduleManager with lists of offices, meeting rooms and employees.
         *
         * @param office_rooms_list_input: list of office room objects
         * @param meeting_rooms_list_input: list of meeting room objects
         * @param employees_list_input: list of employee objects
+        * @param seed: integer seed or numpy.random.Generator used for every random draw,
+        *              None for fresh entropy
+        * @param constrained_sampling: when a meeting clashes, draw its new start uniformly from the
+        *              feasible slots of its room instead of re-drawing at random up to 100 times, and
+        *              replace unavailable attendees with employees who are free for the meeting
+        * @param writer: OutputWriter backend for the output files (CsvWriter, GzipCsvWriter, NpzWriter or
+        *              ParquetWriter), None for plain CSV
+        * @param collect_stats: record a SetupStats (phase times and clash check, retry and replacement counts)
+        *              for each simulated day in self.stats
+        * @param conflict_policy: ConflictPolicy applied to meetings that cannot be booked (DropPolicy,
+        *              CancelPolicy, RescheduleLaterPolicy or ShrinkPolicy), None to drop them
+        * @param statistics: StatisticsSink for the true meeting statistics and cancellation rates of
+        *              each day, None to skip them. Subclasses that always save them (the cancellation
+        *              model in ScheduleManager_cancel) append them to the files in DEFAULT_STATISTICS_DIR,
+        *              the Data/ folder next to this module, when no sink is given
+        * @param timestep_minutes: minutes between the timesteps of the output files, which cover 05:00 to 23:00
+        * @param start_granularity: minutes between the start times a meeting can be given, a divisor of 60
         """
+        if timestep_minutes <= 0 or 18 * 60 % timestep_minutes:
+            raise ValueError("timestep_minutes should be a positive divisor of 1080, the minutes from 05:00 to 23:00.")
+        if start_granularity <= 0 or 60 % start_granularity:
+            raise ValueError("start_granularity should be a positive divisor of 60.")
+        self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
         self.building_schedule = Schedule([])  # List of all events in the building
         self.office_rooms_list = office_rooms_list_input  # List of office_rooms
         self.meeting_rooms_list = meeting_rooms_list_input  # List of meeting rooms
@@ -40,8 +78,24 @@ class ScheduleManager:
         self.people_in_meetings_list = []  # List of people in meetings
         self.number_of_meetings_in_rooms_list = []  # List of integers with the number of meetings in each room
         self.durations_of_meetings_in_minutes_list = []  # List of integers for the duration of meetings in minutes
+        self.simulation_day_index = 0  # Index of the simulated day
+        self.grid = None  # OccupancyGrid of the last simulated day
+        self.constrained_sampling = constrained_sampling  # Sample clashing meetings from feasible slots only
+        self.offices_assigned = False  # Employees are assigned to offices on the first simulated day
+        self.writer = CsvWriter() if writer is None else writer  # Output backend
+        self.collect_stats = collect_stats  # Record a SetupStats for each day
+        self.stats = None  # SetupStats of the last simulated day, None unless collect_stats is set
+        self.conflict_policy = DropPolicy() if conflict_policy is None else conflict_policy
+        self.timestep_minutes = timestep_minutes  # Resolution of the occupancy grid and the output files
+        self.start_granularity = start_granularity  # Meetings start on multiples of this many minutes
+        self.statistics = statistics  # Sink of the true meeting statistics and cancellation rates
+        self.write_statistics = statistics is not None  # Run the save_statistics phase at the end of setup
+        self.cancelled_events_list = []  # Events cancelled by the conflict policy on the last simulated day
+        self.cancelled_count_per_room = {}  # Number of cancelled meetings of each meeting room
+        self.cancelled_meetings = {}  # Records of the cancelled meetings under "cancelled"
+        self.cancel_rate_summary = {}  # Cancellation rates of the last simulated day
 
-    def setup(self, filename_inference, filename_opt):
+    def setup(self, filename_inference, filename_opt, simulation_day_index=0):
         """
         * Main generator routine to create a consistent building schedule.
         * It:
@@ -51,17 +105,118 @@ class ScheduleManager:
         * 4) Creates Event objects (draft) and assigns employees to them.
         * 5) Attempts to schedule each event into its room and into each employee's schedule
         * while avoiding clashes. If a clash appears, the event time or attendees
-        * are re-sampled (with a maximum number of attempts).
+        * are re-sampled (with a maximum number of attempts) before the conflict policy
+        * drops, cancels, reschedules or shrinks the meeting.
         * 6) Builds office occupancy events (normal working periods) based on gaps
         * between employee events and writes CSV outputs.
+        * 7) Writes the true meeting statistics and cancellation rates when the manager has a StatisticsSink.
         *
-        * @param filename_inference: CSV filename for inference-style output
-        * @param filename_opt: CSV filename for optimization-style output (full occupancy table)
+        * @param filename_inference: CSV filename for inference-style output, None to skip writing it
+        * @param filename_opt: CSV filename for optimization-style output (full occupancy table), None to skip writing it
+        * @param simulation_day_index: index of the simulated day
+        * @return: DayResult with the occupancy grid and meeting table of the day
+        """
+        return self.run_day(filename_inference, filename_opt, simulation_day_index)
+
+    def run_day(self, filename_inference, filename_opt, simulation_day_index=0):
         """
+        * Run the setup phases of a day, see setup. simulate_days, iter_days and SimulationRunner call it
+        * directly so that they get the DayResult whatever a subclass's setup returns.
+        *
+        * @param filename_inference: CSV filename for inference-style output, None to skip writing it
+        * @param filename_opt: CSV filename for optimization-style output, None to skip writing it
+        * @param simulation_day_index: index of the simulated day
+        * @return: DayResult with the occupancy grid and meeting table of the day
+        """
+        self.simulation_day_index = simulation_day_index
+        self.stats = SetupStats(simulation_day_index) if self.collect_stats else None
+        self.cancelled_events_list = []
+        self.cancelled_count_per_room = {}
+        self.cancelled_meetings = {}
         # print("\nExperimental class setup:")
         # print("\nNumber of rooms " + str(self.number_of_rooms))
         # print("Number of employees " + str(self.number_of_employees))
 
+        # Take from the room uptime schedule
+        start_of_day = 5
+        work_hours_in_day = 18
+        max_number_of_attempts = 100
+
+        # 1) - 4) Sample the meetings, their durations and their attendees
+        self.run_phase('sample_meetings')
+
+        # 5) Create the draft events with their attendees
+        self.run_phase('draft_events', work_hours_in_day)
+
+        # Book the events into the rooms and the employee schedules, resampling any clashes
+        self.run_phase('resolve_clashes', start_of_day, work_hours_in_day, max_number_of_attempts)
+
+        # 6) Fill the office schedules with the gaps between each employee's events
+        self.run_phase('fill_offices')
+        self.run_phase('sort_schedules')
+
+        # Rasterise the room schedules and write the output files
+        self.run_phase('export', filename_inference, filename_opt)
+
+        # 7) Write the true meeting statistics and the cancellation rates
+        if self.write_statistics:
+            self.run_phase('save_statistics')
+
+        # Dump the schedules only when debug logging is enabled, nothing is formatted otherwise
+        if logger.isEnabledFor(logging.DEBUG):
+            self.log_schedules()
+
+        # self.show_gantt()
+
+        return self.day_result()
+
+    def run_phase(self, phase, *args):
+        """
+        * Run a setup phase, timing it when stats are collected
+        *
+        * @param phase: name of the phase method, e.g. 'resolve_clashes'
+        * @param args: arguments of the phase method
+        """
+        if self.stats is None:
+            return getattr(self, phase)(*args)
+        return self.stats.time_phase(phase, getattr(self, phase), *args)
+
+    def room_is_free(self, event):
+        """
+        * Check that an event neither clashes with its room's events nor falls outside the room's working hours
+        *
+        * @param event: the event to check
+        * @return: True if the event can be booked into its room
+        """
+        if self.stats is not None:
+            self.stats.clash_checks += 1
+        if event.room.events_schedule.is_clash(event):
+            return False
+        if self.stats is not None:
+            self.stats.containment_checks += 1
+        return event.room.working_schedule.is_contained(event)
+
+    def employee_is_free(self, employee, event):
+        """
+        * Check that an event neither clashes with an employee's events nor falls outside their working hours
+        *
+        * @param employee: the employee to check
+        * @param event: the event to check
+        * @return: True if the employee can attend the event
+        """
+        if self.stats is not None:
+            self.stats.clash_checks += 1
+        if employee.events_schedule.is_clash(event):
+            return False
+        if self.stats is not None:
+            self.stats.containment_checks += 1
+        return employee.working_schedule.is_contained(event)
+
+    def sample_meetings(self):
+        """
+        * Setup phase 1-4: sample the number of meetings in each meeting room, their durations,
+        * the number of people in each meeting and the attendees.
+        """
         # 1) Determine the number of meetings in each room
         # self.number_of_meetings_in_rooms_list - contains the information
         # 2) Determine the meeting duration for each meeting
@@ -80,12 +235,16 @@ class ScheduleManager:
         # print(self.number_of_employees_in_meeting_list)
         # print(len(self.people_in_meetings_list))
 
+    def draft_events(self, work_hours_in_day):
+        """
+        * Setup phase 5: create the draft meeting events with their attendees in the building schedule
+        * and remove duplicated attendees. The events are not booked into the rooms at this point.
+        *
+        * @param work_hours_in_day: number of hours in the day a meeting can be scheduled in
+        """
         # 5) Randomly set start time for the events and create the events
         # Need to set these by using the room schedule and prevent scheduling meetings outside of that time frame
 
-        # Take from the room uptime schedule
-        start_of_day = 5
-        work_hours_in_day = 18
         meeting_total_index = 0
         person_in_meeting_index = 0
 
@@ -108,125 +267,187 @@ class ScheduleManager:
                     person_in_meeting_index = person_in_meeting_index + 1
                 meeting_total_index = meeting_total_index + 1
 
-        max_number_of_attempts = 100
         # Remove duplicate employees
         self.remove_duplicate_employees()
 
-        # Assign the events to the rooms and the employees and check the events don't clash
-        for event_index in range(self.building_schedule.get_number_of_events()):
-            # print(self.building_schedule.get_number_of_events())
-            # print(event_index)
-            # print(self.building_schedule.get_event(event_index).room.events_schedule.is_clash(self.building_schedule.get_event(event_index)))
+    def resolve_clashes(self, start_of_day, work_hours_in_day, max_number_of_attempts):
+        """
+        * Setup phase: book each draft event into its room and its attendees' schedules. A meeting that
+        * clashes is moved to a new time and an unavailable attendee is replaced, up to
+        * max_number_of_attempts times before the conflict policy handles the meeting.
+        *
+        * @param start_of_day: hour of the day the meeting start times are sampled from
+        * @param work_hours_in_day: number of hours in the day a meeting can be scheduled in
+        * @param max_number_of_attempts: the number of resamples before the conflict policy is applied
+        """
+        event_indices = range(self.building_schedule.get_number_of_events())
+        if self.conflict_policy.reverse_order:
+            event_indices = reversed(event_indices)
+        for event_index in event_indices:
+            self.book_event(event_index, start_of_day, work_hours_in_day, max_number_of_attempts)
+
+    def book_event(self, event_index, start_of_day, work_hours_in_day, max_number_of_attempts, original_start=None):
+        """
+        * Book one event of the building schedule into its room and its attendees' schedules
+        *
+        * @param event_index: index of the event in the building schedule
+        * @param start_of_day: hour of the day the meeting start times are sampled from
+        * @param work_hours_in_day: number of hours in the day a meeting can be scheduled in
+        * @param max_number_of_attempts: the number of resamples before the conflict policy is applied
+        * @param original_start: start the meeting was drafted with, None for the start of the event
+        """
+        event = self.building_schedule.get_event(event_index)
+        # The resampling below moves the event, the conflict policy works from the drafted start
+        if original_start is None:
+            original_start = event.start_minute
+        count = 0
+        while not self.room_is_free(event):
+            count = count + 1
+            if count > max_number_of_attempts:
+                break
+            # Try first to change the time of the meeting
+            if self.constrained_sampling:
+                new_event = self.random_feasible_event(start_of_day, work_hours_in_day,
+                                                       event.duration_in_minutes(), event.room)
+                if new_event is None:
+                    # No slot fits, so the next check hands the event to the conflict policy
+                    count = max_number_of_attempts
+                    continue
+            else:
+                new_event = self.random_event(start_of_day, work_hours_in_day, event.duration_in_minutes(),
+                                              event.room)
+            # Add the employees to the new_event
+            new_event.employees = event.employees
+            self.building_schedule.replace_event(event, new_event)
+            event = new_event
+        if self.stats is not None:
+            self.stats.room_retries.append(count)
+        if count > max_number_of_attempts:
+            self.resolve_conflict(event_index, ROOM_CONFLICT, [], start_of_day, work_hours_in_day,
+                                  max_number_of_attempts, original_start)
+            return
+
+        booked_employees = []
+        for employee_index in range(len(event.employees)):
             count = 0
-            while self.building_schedule.get_event(event_index).room.events_schedule.is_clash(
-                    self.building_schedule.get_event(event_index)) or not self.building_schedule.get_event(
-                    event_index).room.working_schedule.is_contained(self.building_schedule.get_event(event_index)):
-                # ("Clash:")
-                # print(self.building_schedule.get_event(event_index).room.events_schedule.is_clash(self.building_schedule.get_event(event_index)))
-                # print("Contained:")
-                # print(self.building_schedule.get_event(event_index).room.working_schedule.is_contained(self.building_schedule.get_event(event_index)))
+            while not self.employee_is_free(event.employees[employee_index], event):
+                # Try to assign a new employee who is not in the meeting yet
                 count = count + 1
                 if count > max_number_of_attempts:
-                    print("Event can't be scheduled")
-                    break   # Why not create a new event?
-                # print("Room is unavailable for booking")
-                # Try first to change the time of the meeting
-                current_event = self.building_schedule.get_event(event_index)
-                new_event = self.random_event(start_of_day, work_hours_in_day,
-                                              self.durations_of_meetings_in_minutes_list[event_index],
-                                              self.building_schedule.get_event(event_index).room)
-                # Add the employees to the new_event
-                new_event.employees = current_event.employees
-                self.building_schedule.replace_event(current_event, new_event)
-            # print(self.building_schedule.get_event(event_index).room.events_schedule.is_clash(self.building_schedule.get_event(event_index)))
-            # print("Room is available for booking")
-            # print("Event_index: " + str(event_index))
-            if not count > max_number_of_attempts:
-                for employee_index in range(len(self.building_schedule.get_event(event_index).employees)):
-                    count = 0
-                    while self.building_schedule.get_event(event_index).employees[employee_index].events_schedule.is_clash(self.building_schedule.get_event(event_index)) or not self.building_schedule.get_event(event_index).employees[employee_index].working_schedule.is_contained(self.building_schedule.get_event(event_index)):
-                        # print("Employee is unavailable for booking")
-                        # Try to assign a new employee also need to check that the employee is only in the list once
-                        count = count + 1
-                        if count > max_number_of_attempts:
-                            # print("Event can't be scheduled")
-                            break   # Why not create a new event instead???
-                        replacement_employee = self.random_employee_duplicate(
-                            self.building_schedule.get_event(event_index).employees[employee_index],
-                            self.building_schedule.get_event(
-                                event_index).employees)
-                        self.building_schedule.get_event(event_index).employees[employee_index] = replacement_employee
-                    if count <= max_number_of_attempts:
-                        self.building_schedule.get_event(event_index).employees[employee_index].add_event(
-                            self.building_schedule.get_event(event_index))
-                if count <= max_number_of_attempts:
-                    self.building_schedule.get_event(event_index).room.add_event(
-                        self.building_schedule.get_event(event_index))
-
-        # Assign employees to office - This should have already been done
-        # print("Number of employees: " + str(len(self.employees_list)))
-        # print("Number of offices: " + str(len(self.office_rooms_list)))
-        k = 0
-        for office in self.office_rooms_list:
-            for i in range(office.max_office_occupancy):
-                if k == self.number_of_employees:
                     break
-                self.employees_list[k].assigned_office = office
-                k = k + 1
+                if self.stats is not None:
+                    self.stats.employee_replacements += 1
+                if self.constrained_sampling:
+                    replacement_employee = self.random_available_employee(event, event.employees)
+                else:
+                    replacement_employee = self.random_employee_duplicate(event.employees[employee_index],
+                                                                          event.employees)
+                if replacement_employee is None:
+                    # Nobody can replace the employee, so the next check hands the event to the conflict policy
+                    count = max_number_of_attempts
+                    continue
+                event.employees[employee_index] = replacement_employee
+            if count > max_number_of_attempts:
+                if self.conflict_policy.skip_unavailable_attendees:
+                    continue
+                self.resolve_conflict(event_index, EMPLOYEE_CONFLICT, booked_employees, start_of_day,
+                                      work_hours_in_day, max_number_of_attempts, original_start)
+                return
+            event.employees[employee_index].add_event(event)
+            booked_employees.append(event.employees[employee_index])
 
-        lunch_events = []
-        before_events = []
-        after_events = []
-
-        for employee_index in range(len(self.employees_list)):
-            # self.employees_list[employee_index].assigned_office = self.office_rooms_list[employee_index]
-            start_time = self.employees_list[employee_index].working_schedule.get_event(0).end_time
-            end_time = self.employees_list[employee_index].working_schedule.get_event(1).start_time
-            lunch_events.append(Event(start_time, end_time, "Lunch", None, [self.employees_list[employee_index]]))
-            start_time = self.employees_list[employee_index].working_schedule.get_event(0).start_time - timedelta(seconds=1)
-            end_time = self.employees_list[employee_index].working_schedule.get_event(0).start_time
-            before_events.append(Event(start_time, end_time, "Arriving", None, [self.employees_list[employee_index]]))
-            start_time = self.employees_list[employee_index].working_schedule.get_event(1).end_time
-            end_time = start_time + timedelta(seconds=1)
-            after_events.append(Event(start_time, end_time, "Arriving", None, [self.employees_list[employee_index]]))
-            self.employees_list[employee_index].add_event(lunch_events[len(lunch_events)-1])
-            self.employees_list[employee_index].add_event(before_events[len(lunch_events)-1])
-            self.employees_list[employee_index].add_event(after_events[len(lunch_events) - 1])
+        # An event whose last attendee was skipped is not booked into its room
+        if count <= max_number_of_attempts:
+            event.room.add_event(event)
+            if self.stats is not None:
+                self.stats.events_booked += 1
+        elif self.stats is not None:
+            self.stats.events_dropped += 1
+
+    def resolve_conflict(self, event_index, reason, booked_employees, start_of_day, work_hours_in_day,
+                         max_number_of_attempts, original_start):
+        """
+        * Release the attendees already booked into an event that could not be booked and let the
+        * conflict policy give it up or replace it. A replacement is booked in place of the event.
+        *
+        * @param event_index: index of the event in the building schedule
+        * @param reason: ROOM_CONFLICT or EMPLOYEE_CONFLICT
+        * @param booked_employees: attendees the event was already added to
+        * @param start_of_day: hour of the day the meeting start times are sampled from
+        * @param work_hours_in_day: number of hours in the day a meeting can be scheduled in
+        * @param max_number_of_attempts: the number of resamples before the conflict policy is applied
+        * @param original_start: start the meeting was drafted with, in minutes from midnight of DAY_ZERO
+        """
+        event = self.building_schedule.get_event(event_index)
+        for employee in booked_employees:
+            employee.remove_event(event)
+        new_event = self.conflict_policy.resolve(self, event_index, reason, start_of_day, work_hours_in_day,
+                                                 original_start)
+        if new_event is None:
+            if self.stats is not None:
+                self.stats.events_dropped += 1
+            return
+        self.building_schedule.replace_event(event, new_event)
+        self.book_event(event_index, start_of_day, work_hours_in_day, max_number_of_attempts, original_start)
+
+    def attendees_are_free(self, event):
+        """
+        * Check that every attendee of an event is free for it and working throughout it
+        *
+        * @param event: the event
+        * @return: True if no attendee's events clash with the event
+        """
+        return all(self.employee_is_free(employee, event) for employee in event.employees)
+
+    def cancel_event(self, event_index, reason):
+        """
+        * Cancel an event: record it with the cancelled meetings of the day and in the cancellation
+        * count of its room, and remove it from the building schedule
+        *
+        * @param event_index: index of the event in the building schedule
+        * @param reason: why the event was cancelled, ROOM_CONFLICT or EMPLOYEE_CONFLICT
+        """
+        cancelled_event = self.building_schedule.get_event(event_index)
+        room_name = cancelled_event.room.room_name
+        self.cancelled_count_per_room[room_name] = self.cancelled_count_per_room.get(room_name, 0) + 1
+        self.cancelled_events_list.append(cancelled_event)
+        self.cancelled_meetings.setdefault("cancelled", []).append({
+            'room_name': room_name,
+            'start': cancelled_event.start_time.strftime("%Y-%m-%d %H:%M"),
+            'end': cancelled_event.end_time.strftime("%Y-%m-%d %H:%M"),
+            'duration_minutes': cancelled_event.duration_in_minutes(),
+            'employees': [employee.employee_id for employee in cancelled_event.employees],
+            'reason': reason,
+            'day': self.simulation_day_index
+        })
+        self.building_schedule.remove_event(cancelled_event)
+
+    def fill_offices(self):
+        """
+        * Setup phase 6: fill each office schedule with the normal working periods of its employees,
+        * the parts of their working schedule not taken by their meetings, and add each period to
+        * the schedule of its employee.
+        """
+        # Assign employees to office - only needed on the first day
+        if not self.offices_assigned:
+            self.assign_offices()
 
         # Sort all of the meeting room schedules
         for meeting_room in self.meeting_rooms_list:
             meeting_room.events_schedule.sort()
 
-        # Sort all employee's schedules
-        for employee in self.employees_list:
-            employee.events_schedule.sort()
-
-        # Set up the office schedules based on the events above
+        # The normal working periods are the complement of the employee's events within their shifts
         for employee in self.employees_list:
             office = employee.assigned_office
-            for event_index in range(1, len(employee.events_schedule.events)):
-                start_time = employee.events_schedule.events[event_index-1].end_time
-                end_time = employee.events_schedule.events[event_index].start_time
-                if not start_time == end_time:
-                    new_event = Event(start_time, end_time, "Normal working", office, [employee])
-                    office.events_schedule.add_event(new_event)
-
-        # Remove inserted events from employees
-        for employee_index in range(len(self.employees_list)):
-            self.employees_list[employee_index].remove_event(lunch_events[employee_index])
-            self.employees_list[employee_index].remove_event(before_events[employee_index])
-            self.employees_list[employee_index].remove_event(after_events[employee_index])
-
-        # Add office events to employee events
-        for employee in self.employees_list:
-            for event in employee.assigned_office.events_schedule.events:
-                in_event = False
-                for event_employees in event.employees:
-                    if employee == event_employees:
-                        in_event = True
-                if in_event:
-                    employee.add_event(event)
+            for start_time, end_time in self.free_intervals(employee):
+                new_event = Event.from_minutes(start_time, end_time, "Normal working", office, [employee])
+                office.events_schedule.add_event(new_event)
+                employee.add_event(new_event)
 
+    def sort_schedules(self):
+        """
+        * Setup phase: sort the employee, office and meeting room schedules with the earliest event first
+        """
         # Sort all the employee's schedules
         for employee in self.employees_list:
             employee.events_schedule.sort()
@@ -235,32 +456,211 @@ class ScheduleManager:
         for office in self.office_rooms_list:
             office.events_schedule.sort()
 
+        # Sort all the meeting room schedules, the meeting table of the day is read from them in order
+        for meeting_room in self.meeting_rooms_list:
+            meeting_room.events_schedule.sort()
+
+    def export(self, filename_inference, filename_opt):
+        """
+        * Setup phase: rasterise the room schedules into the occupancy grid of the day and write the output files
+        *
+        * @param filename_inference: inference output filename, None to skip writing it
+        * @param filename_opt: optimization output filename, None to skip writing it
+        """
+        # Rasterise the room schedules once for both output files, 05:00 to 23:00 inclusive
+        timestep = timedelta(minutes=self.timestep_minutes)
+        self.grid = self.occupancy_grid(datetime(2010, 1, 1, 5, 00, 00), timestep)
+        if self.stats is not None:
+            self.stats.events_written = sum(len(room.events_schedule.events)
+                                            for room in self.office_rooms_list + self.meeting_rooms_list)
+
         # Write to csv file - For Lingfeng
-        self.inference_output_file(filename_inference, timedelta(minutes=15), datetime(2010, 1, 1, 5, 00, 00))
+        if filename_inference is not None:
+            self.inference_output_file(filename_inference, timestep, datetime(2010, 1, 1, 5, 00, 00), self.grid)
 
         # Write to csv file - For Michal - Full occupancy
-        self.optimization_output_file(filename_opt, datetime(2010, 1, 1, 5, 00, 00))
+        if filename_opt is not None:
+            self.optimization_output_file(filename_opt, datetime(2010, 1, 1, 5, 00, 00), self.grid)
 
-        self.print_sorted_all()
+    def save_statistics(self):
+        """
+        * Setup phase: write the true meeting statistics and the cancellation rates of the day to the
+        * manager's StatisticsSink, or to a sink appending to the files in DEFAULT_STATISTICS_DIR if it has none
+        """
+        statistics = StatisticsSink(DEFAULT_STATISTICS_DIR) if self.statistics is None else self.statistics
+        self.true_number_of_meetings(statistics)
+        self.true_number_of_people_in_meetings(statistics)
+        self.true_duration_of_meetings(statistics)
 
-        # self.show_gantt()
+        self.cancel_rate_summary = {}
+        self.cancel_rate_summary["rates_per_room"], self.cancel_rate_summary["overall_rate"] = \
+            self.compute_cancellation_rates()
+        logger.debug("Cancelled meeting count: %d", len(self.cancelled_meetings.get("cancelled", [])))
+        logger.debug("Cancel rate: %s", self.cancel_rate_summary)
+
+        try:
+            statistics.write('cancel_rate_summary', self.cancel_rate_summary)
+        except Exception as e:
+            logger.error("Error writing cancel_rate_summary.json: %s", e)
+        if self.statistics is None:
+            statistics.close()
+
+    def get_cancelled_events(self):
+        """
+        * Gets the events cancelled on the last simulated day
+        *
+        * @return: list of the cancelled Event objects
+        """
+        return self.cancelled_events_list
+
+    def get_cancelled_count_per_room(self):
+        """
+        * Gets the number of cancelled meetings of each meeting room
+        *
+        * @return: dictionary mapping room names to their number of cancellations
+        """
+        return self.cancelled_count_per_room
+
+    def compute_cancellation_rates(self):
+        """
+        * Compute the cancellation rate of each meeting room and of the building, the cancelled
+        * meetings over the sampled meetings
+        *
+        * @return: (rates_per_room, overall_rate), rates_per_room maps room names to their rate
+        """
+        rates_per_room = {}
+        total_attempted = sum(self.number_of_meetings_in_rooms_list)
+        total_cancelled = sum(self.cancelled_count_per_room.values())
+        overall_rate = total_cancelled / total_attempted if total_attempted > 0 else 0
+
+        for room_index, room in enumerate(self.meeting_rooms_list):
+            attempted_in_room = self.number_of_meetings_in_rooms_list[room_index]
+            cancelled_in_room = self.cancelled_count_per_room.get(room.room_name, 0)
+            rates_per_room[room.room_name] = cancelled_in_room / attempted_in_room if attempted_in_room > 0 else 0
+
+        return rates_per_room, overall_rate
+
+    def true_number_of_meetings(self, statistics):
+        """
+        * Write the true number of meetings of each meeting room to the num_of_meetings stream
+        *
+        * @param statistics: StatisticsSink to write to
+        """
+        statistics.write('num_of_meetings', [meeting_room.events_schedule.number_of_meetings()
+                                             for meeting_room in self.meeting_rooms_list])
+
+    def true_number_of_people_in_meetings(self, statistics):
+        """
+        * Write the true number of people in each meeting of each meeting room to the num_of_people stream
+        *
+        * @param statistics: StatisticsSink to write to
+        """
+        statistics.write('num_of_people', [meeting_room.events_schedule.number_of_people_in_meetings()
+                                           for meeting_room in self.meeting_rooms_list])
+
+    def true_duration_of_meetings(self, statistics):
+        """
+        * Write the true duration in minutes of each meeting of each meeting room to the
+        * duration_of_meetings_min stream
+        *
+        * @param statistics: StatisticsSink to write to
+        """
+        statistics.write('duration_of_meetings_min',
+                         [[duration.total_seconds() / 60 for duration in meeting_room.events_schedule.duration_of_meetings()]
+                          for meeting_room in self.meeting_rooms_list])
+
+    def assign_offices(self):
+        """
+        * Assign the employees to the offices in turn, filling each office up to its maximum occupancy.
+        * The assignment is part of the static building model, so it is kept across days.
+        """
+        k = 0
+        for office in self.office_rooms_list:
+            for i in range(office.max_office_occupancy):
+                if k == self.number_of_employees:
+                    break
+                self.employees_list[k].assigned_office = office
+                k = k + 1
+        self.offices_assigned = True
+
+    def reset_day(self):
+        """
+        * Clear the per-day state so that the next setup simulates a new day on the same building.
+        * The rooms, employees, working schedules, office assignments and PMF samplers are kept,
+        * only the event schedules and the sampled meeting lists are emptied.
+        """
+        self.building_schedule.clear()
+        for room in self.office_rooms_list + self.meeting_rooms_list:
+            room.events_schedule.clear()
+        for employee in self.employees_list:
+            employee.events_schedule.clear()
+        self.total_meetings = 0
+        self.number_of_employees_in_meeting_list = []
+        self.people_in_meetings_list = []
+        self.number_of_meetings_in_rooms_list = []
+        self.durations_of_meetings_in_minutes_list = []
+        self.grid = None
+
+    def simulate_days(self, number_of_days, filename_inference=None, filename_opt=None, first_day_index=1):
+        """
+        * Simulate consecutive days on the same building, resetting the per-day state between days.
+        *
+        * @param number_of_days: the number of days to simulate
+        * @param filename_inference: inference output filename with a {day} field, e.g. "Data/office_Num{day}.csv",
+        *                            None to skip writing it
+        * @param filename_opt: optimization output filename with a {day} field, None to skip writing it
+        * @param first_day_index: index of the first simulated day
+        * @return: list of DayResult objects, one per day
+        """
+        results = []
+        for day in range(first_day_index, first_day_index + number_of_days):
+            self.reset_day()
+            results.append(self.run_day(None if filename_inference is None else filename_inference.format(day=day),
+                                        None if filename_opt is None else filename_opt.format(day=day),
+                                        simulation_day_index=day))
+        return results
+
+    def iter_days(self, number_of_days, seed=None, first_day_index=1):
+        """
+        * Simulate consecutive days on the same building and yield the result of each day as it is
+        * simulated. No output files are written, and the true meeting statistics and cancellation rates
+        * only go to the manager's StatisticsSink if it was given one, even for managers that otherwise
+        * append them to the files in DEFAULT_STATISTICS_DIR every day. A DayResult only holds arrays and plain records (the
+        * occupancy grid, the meeting table and the cancelled meetings), and the Event objects of a day
+        * are dropped before its result is yielded, so the memory used stays the same however many
+        * days are consumed, as long as the caller does not keep the results.
+        *
+        * @param number_of_days: the number of days to simulate
+        * @param seed: integer seed or numpy.random.Generator the days are drawn from, None to carry on
+        *              with the manager's generator
+        * @param first_day_index: index of the first simulated day
+        * @return: generator of DayResult objects, one per day
+        """
+        if seed is not None:
+            self.rng = seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+        for day in range(first_day_index, first_day_index + number_of_days):
+            self.reset_day()
+            write_statistics = self.write_statistics
+            self.write_statistics = write_statistics and self.statistics is not None
+            try:
+                result = self.run_day(None, None, simulation_day_index=day)
+            finally:
+                self.write_statistics = write_statistics
+            # Release the day's events before handing the result over
+            self.reset_day()
+            self.cancelled_events_list = []
+            yield result
 
     def set_number_of_meetings_in_room(self, pmf):
         """
         * Sample a number of meetings for a room using the provided PMF object.
-        * pmf is assumed to provide:
-        * - convert_pmf_values_to_cmf(): returns cumulative probabilities (CDF)
-        * - get_values(index): returns the PMF value corresponding to an index
+        * pmf is assumed to provide sample(rng), which draws from a cached
+        * cumulative mass function built once per PMF.
         *
         * Returns the sampled integer and appends it to number_of_meetings_in_rooms_list.
         """
         # self.number_of_meetings_in_rooms_list.extend([self.randint(2, max_meeting_occupancy)])
-        prob = random.random()
-        cdf = pmf.convert_pmf_values_to_cmf()
-        sampled = -1  # -1 should never be returned under normal circumstances
-        for index in range(len(cdf) - 1):
-            if not (prob < cdf[index]) & (prob < cdf[index + 1]):
-                sampled = pmf.get_values(index)
+        sampled = pmf.sample(self.rng)
         self.number_of_meetings_in_rooms_list.extend([sampled])
         return sampled
 
@@ -269,18 +669,13 @@ class ScheduleManager:
         * Generic sampler for PMFs following the same technique as set_number_of_meetings_in_room.
         * Returns the sampled PMF value.
         """
-        prob = random.random()
-        cdf = pmf.convert_pmf_values_to_cmf()
-        sampled = -1  # -1 should never be returned under normal circumstances
-        for index in range(len(cdf) - 1):
-            if not (prob < cdf[index]) & (prob < cdf[index + 1]):
-                sampled = pmf.get_values(index)
-        return sampled
+        return pmf.sample(self.rng)
 
     def random_event(self, start_of_day, work_hours_in_day, duration_of_meeting, room):
         """
         * Create a random Event object within the allowed working window.
-        * Start time is chosen on the hour plus optionally a half hour (0 or 30 mins).
+        * Start time is chosen on the hour plus a multiple of start_granularity minutes
+        * (0 or 30 mins by default).
         * The function computes end time from the duration (in minutes) and corrects
         * wrap-around if the end hour would exceed 23:00.
         *
@@ -291,7 +686,7 @@ class ScheduleManager:
         * @return: Event instance with chosen start/end times and empty employee list
         """
         hour = self.randint(0, work_hours_in_day)
-        half_hour = 30 * self.randint(0, 1)
+        half_hour = self.start_granularity * self.randint(0, 60 // self.start_granularity - 1)
         end_half_hour = math.floor((half_hour + duration_of_meeting) / 60)
         end_mins = half_hour + duration_of_meeting - 60 * end_half_hour
 
@@ -305,12 +700,81 @@ class ScheduleManager:
         # print("end hour " + str(hour + end_half_hour + start_of_day))
         # print("end half hour " + str(end_mins))
 
-        # Create datetime objects
+        # Convert to minutes from midnight
         if hour + end_half_hour + start_of_day > 23:
             hour = 22 - hour - end_half_hour
-        start_time = datetime(2010, 1, 1, hour + start_of_day, half_hour, 00)
-        end_time = datetime(2010, 1, 1, hour + end_half_hour + start_of_day, end_mins, 00)
-        return Event(start_time, end_time, "Meeting", room, [])
+        start_time = 60 * (hour + start_of_day) + half_hour
+        end_time = 60 * (hour + end_half_hour + start_of_day) + end_mins
+        return Event.from_minutes(start_time, end_time, "Meeting", room, [])
+
+    def free_intervals(self, room):
+        """
+        * Determine the periods in which a room is open (inside one of its working_schedule
+        * events) and not booked by any event in its events_schedule, in one sweep over the
+        * sorted working and booked periods. Employees have the same two schedules, so this
+        * also gives the periods an employee is working and not in a meeting.
+        *
+        * @param room: room or employee object
+        * @return: list of (start, end) pairs in minutes, in time order
+        """
+        booked = sorted((event.start_minute, event.end_minute) for event in room.events_schedule.events)
+        intervals = []
+        first_booked = 0
+        for working_start, working_end in sorted((event.start_minute, event.end_minute)
+                                                 for event in room.working_schedule.events):
+            # Skip the bookings that end before this working period starts
+            while first_booked < len(booked) and booked[first_booked][1] <= working_start:
+                first_booked += 1
+            free_from = working_start
+            for booked_start, booked_end in booked[first_booked:]:
+                if booked_start >= working_end:
+                    break
+                if booked_start > free_from:
+                    intervals.append((free_from, booked_start))
+                free_from = max(free_from, booked_end)
+            if free_from < working_end:
+                intervals.append((free_from, working_end))
+        return intervals
+
+    def feasible_start_times(self, start_of_day, work_hours_in_day, duration_of_meeting, room):
+        """
+        * Determine every start time random_event can produce (multiples of start_granularity minutes
+        * between start_of_day and the last start of hour start_of_day + work_hours_in_day) at which a
+        * meeting of the given duration fits inside the room's free intervals.
+        *
+        * @param start_of_day: integer hour offset representing earliest start (e.g. 5 = 05:00)
+        * @param work_hours_in_day: integer number of hours available to schedule within
+        * @param duration_of_meeting: integer duration in minutes
+        * @param room: room object
+        * @return: sorted list of start times in minutes
+        """
+        granularity = self.start_granularity
+        earliest_start = 60 * start_of_day
+        latest_start = 60 * (start_of_day + work_hours_in_day + 1) - granularity
+        start_times = set()
+        for free_start, free_end in self.free_intervals(room):
+            first_start = max(earliest_start, granularity * math.ceil(free_start / granularity))
+            last_start = min(latest_start, free_end - duration_of_meeting)
+            start_times.update(range(first_start, last_start + 1, granularity))
+        return sorted(start_times)
+
+    def random_feasible_event(self, start_of_day, work_hours_in_day, duration_of_meeting, room):
+        """
+        * Create a meeting Event whose start time is drawn uniformly from the feasible start times
+        * of the room, so the event neither clashes with the room's bookings nor falls outside
+        * its working schedule.
+        *
+        * @param start_of_day: integer hour offset representing earliest start (e.g. 5 = 05:00)
+        * @param work_hours_in_day: integer number of hours available to schedule within
+        * @param duration_of_meeting: integer duration in minutes
+        * @param room: room object
+        * @return: Event instance with an empty employee list, or None if the meeting fits nowhere
+        """
+        start_times = self.feasible_start_times(start_of_day, work_hours_in_day, duration_of_meeting, room)
+        if not start_times:
+            return None
+        start_time = start_times[self.randint(0, len(start_times) - 1)]
+        return Event.from_minutes(start_time, start_time + duration_of_meeting, "Meeting", room, [])
 
     def find_duplicates(self, lst):
         """
@@ -337,21 +801,40 @@ class ScheduleManager:
         *
         * @param employee: employee object to avoid
         * @param employee_list: list of employees currently assigned to the event
-        * @return: replacement_employee
+        * @return: replacement_employee, or None if every employee is already in the event
         """
-        replacement_employee = None
-        no_repeates = True
-        while no_repeates:
-            no_repeates = False
+        excluded_employees = set(employee_list)
+        excluded_employees.add(employee)
+        if len(excluded_employees) >= self.number_of_employees:
+            return None
+        replacement_employee = self.employees_list[self.randint(0, self.number_of_employees - 1)]
+        while replacement_employee in excluded_employees:
             replacement_employee = self.employees_list[self.randint(0, self.number_of_employees - 1)]
-            if replacement_employee is employee:
-                no_repeates = True
-            else:
-                for employees in employee_list:
-                    if replacement_employee is employees:
-                        no_repeates = True
         return replacement_employee
 
+    def random_available_employee(self, event, employee_list):
+        """
+        * Sample a replacement attendee uniformly from the employees who are free for the
+        * whole event (no clash in their events_schedule, checked against its availability
+        * bitmap, and contained in their working_schedule) and not already in `employee_list`.
+        *
+        * @param event: the event that needs a replacement attendee
+        * @param employee_list: list of employees currently assigned to the event
+        * @return: replacement_employee, or None if no employee is available
+        """
+        excluded_employees = set(employee_list)
+        event_mask = event.minutes_mask()
+        candidates = [employee for employee in self.employees_list if employee not in excluded_employees]
+        free_employees = [employee for employee in candidates if not employee.events_schedule.busy_mask() & event_mask]
+        available_employees = [employee for employee in free_employees if employee.working_schedule.is_contained(event)]
+        if self.stats is not None:
+            # One clash test per candidate, and a working-hours test for each candidate without a clash
+            self.stats.clash_checks += len(candidates)
+            self.stats.containment_checks += len(free_employees)
+        if not available_employees:
+            return None
+        return available_employees[self.randint(0, len(available_employees) - 1)]
+
     def schedule_as_dictionary_format(self, schedule):
         """
         * Convert a Schedule object into the simplified dictionary/list format used
@@ -369,34 +852,10 @@ class ScheduleManager:
         """
         * Render a simple Gantt-like chart using matplotlib. `tasks` is expected to be
         * a dict mapping labels -> list of (start_str, end_str) tuples in HH:MM format.
+        * matplotlib is only imported the first time a chart is drawn.
         """
-        # Create a figure and axis
-        fig, ax = plt.subplots()
-
-        # Set the y-axis limits and tick labels
-        ax.set_ylim(0.5, len(tasks) + 0.5)
-        ax.set_yticks(list(range(1, len(tasks) + 1)))
-        ax.set_yticklabels(list(tasks.keys()))
-
-        # Plot each task as a series of horizontal bars, shifted down by half their height
-        for i, (task, segments) in enumerate(tasks.items()):
-            for start, end in segments:
-                height = 0.4
-                ax.broken_barh([(self.to_minutes(start), self.to_minutes(end) - self.to_minutes(start))], (i + 1 - height / 2, height),
-                               facecolors='blue')
-
-        # Set the x-axis limits and tick labels
-        ax.set_xlim(300, 1380)
-        ax.set_xticks(range(300, 1380, 60))
-        ax.set_xticklabels([self.to_time(minutes) for minutes in range(300, 1380, 60)])
-
-        # Set the axis labels and title
-        ax.set_xlabel('Time')
-        ax.set_ylabel('Employee')
-        ax.set_title('Daily Schedule')
-
-        # Show the chart
-        plt.show()
+        import Visualisation
+        Visualisation.gantt(tasks)
 
     def to_minutes(self, time_str):
         """
@@ -420,10 +879,9 @@ class ScheduleManager:
         """
         for meeting_room in range(len(self.meeting_rooms_list)):
             self.set_number_of_meetings_in_room(self.meeting_rooms_list[meeting_room].number_of_meetings_in_room_pmf)
-            print()
-            for i in range(self.number_of_meetings_in_rooms_list[meeting_room]):
-                self.durations_of_meetings_in_minutes_list.append(
-                    self.set_sample_pmf_values(self.meeting_rooms_list[meeting_room].meeting_durations_in_minutes))
+            self.durations_of_meetings_in_minutes_list.extend(
+                self.meeting_rooms_list[meeting_room].meeting_durations_in_minutes.sample_n(
+                    self.rng, self.number_of_meetings_in_rooms_list[meeting_room]).tolist())
 
     def employees_in_meeting(self):
         """
@@ -433,13 +891,12 @@ class ScheduleManager:
         * counts appended to number_of_employees_in_meeting_list.
         """
         for meeting_room in range(len(self.meeting_rooms_list)):
-            for meeting_index in range(self.number_of_meetings_in_rooms_list[meeting_room]):
-                number_of_people = self.set_sample_pmf_values(
-                    self.meeting_rooms_list[meeting_room].number_of_employees_in_event)
-                self.number_of_employees_in_meeting_list.extend([number_of_people])
-                for people in range(number_of_people):
-                    self.people_in_meetings_list.append(
-                        self.employees_list[self.randint(0, self.number_of_employees - 1)])
+            # Draw the head-counts of all the room's meetings, then all of their attendees, in two batches
+            numbers_of_people = self.meeting_rooms_list[meeting_room].number_of_employees_in_event.sample_n(
+                self.rng, self.number_of_meetings_in_rooms_list[meeting_room]).tolist()
+            self.number_of_employees_in_meeting_list.extend(numbers_of_people)
+            for employee_index in self.randint_n(0, self.number_of_employees - 1, sum(numbers_of_people)):
+                self.people_in_meetings_list.append(self.employees_list[employee_index])
 
     def remove_duplicate_employees(self):
         """
@@ -454,34 +911,55 @@ class ScheduleManager:
                 for employee in duplicate_employees:
                     replacement_employee = self.random_employee_duplicate(employee, self.building_schedule.get_event(
                         event_index).employees)
+                    if replacement_employee is None:
+                        # Every employee is already in the meeting, so drop the duplicate place
+                        self.building_schedule.get_event(event_index).remove_employee(employee)
+                        continue
                     self.building_schedule.get_event(event_index).employees[
                         self.building_schedule.get_event(event_index).employees.index(employee)] = replacement_employee
 
-    def show_gantt(self):
+    def gantt_chart(self, kind='meeting_rooms', path=None, top_n=None, group_by_office=False, show=False):
         """
-        * Helper that prepares meeting-room, office-room and employee task dictionaries
-        * and calls gantt() to visualise them. The keys are labelled strings and values
-        * are lists of (start,end) tuples as produced by schedule_as_dictionary_format().
+        * Draw the schedules of the meeting rooms, offices or employees of the last simulated
+        * day as one Gantt chart, coloured by event type. The bars are built straight from the
+        * event minutes, so whole buildings can be drawn. matplotlib is only imported the first
+        * time a chart is drawn, and charts that are only saved need no display.
+        *
+        * @param kind: 'meeting_rooms', 'offices' or 'employees'
+        * @param path: file the chart is saved to, e.g. "gantt.png" or "gantt.svg", None to not save it
+        * @param top_n: draw only the top_n busiest rows (or offices when grouping), None to draw all
+        * @param group_by_office: draw the employees of each office as lanes of one row
+        * @param show: show the chart with pyplot
+        * @return: the matplotlib Figure
         """
-        meeting_room_tasks = {}
-        for meeting_room in self.meeting_rooms_list:
-            tasks = self.schedule_as_dictionary_format(meeting_room.events_schedule)
-            meeting_room_tasks[f"MR {meeting_room.room_name}"] = tasks
-
-        office_room_tasks = {}
-        for office_room in self.office_rooms_list:
-            tasks = self.schedule_as_dictionary_format(office_room.events_schedule)
-            office_room_tasks[f"O {office_room.room_name}"] = tasks
+        import Visualisation
+        if kind == 'meeting_rooms':
+            entities, labels = self.meeting_rooms_list, [f"MR {room.room_name}" for room in self.meeting_rooms_list]
+        elif kind == 'offices':
+            entities, labels = self.office_rooms_list, [f"O {room.room_name}" for room in self.office_rooms_list]
+        elif kind == 'employees':
+            entities, labels = self.employees_list, [f"Emp {employee.employee_id}" for employee in self.employees_list]
+        else:
+            raise ValueError("kind must be 'meeting_rooms', 'offices' or 'employees', not " + repr(kind) + ".")
+        groups = None
+        if group_by_office and kind == 'employees':
+            groups = [f"O {employee.assigned_office.room_name}" if employee.assigned_office is not None
+                      else "No office" for employee in self.employees_list]
+        rows, starts, ends, event_types = Visualisation.schedule_segments(
+            [entity.events_schedule for entity in entities])
+        ylabel = {'meeting_rooms': 'Meeting room', 'offices': 'Office', 'employees': 'Employee'}[kind]
+        if groups is not None:
+            ylabel = 'Office'
+        return Visualisation.gantt_chart(labels, rows, starts, ends, event_types, groups=groups, top_n=top_n,
+                                         path=path, show=show, ylabel=ylabel)
 
-        # Would be good to colour code
-        employee_tasks = {}
-        for employee in self.employees_list:
-            tasks = self.schedule_as_dictionary_format(employee.events_schedule)
-            employee_tasks[f"Emp {employee.employee_id}"] = tasks
-
-        self.gantt(meeting_room_tasks)
-        self.gantt(office_room_tasks)
-        self.gantt(employee_tasks)
+    def show_gantt(self):
+        """
+        * Show the meeting-room, office-room and employee schedules of the last simulated
+        * day as three Gantt charts, coloured by event type.
+        """
+        for kind in ('meeting_rooms', 'offices', 'employees'):
+            self.gantt_chart(kind, show=True)
 
     def print_sorted_all(self):
         """
@@ -503,119 +981,83 @@ class ScheduleManager:
             employee.events_schedule.sort()
             employee.events_schedule.print()
 
-    def optimization_output_file(self, filename, time_now_start):
+    def log_schedules(self):
+        """
+        * Log the schedules for meeting rooms, offices and employees at debug level, in the
+        * format of print_sorted_all. setup calls it only when debug logging is enabled,
+        * after the schedules have been sorted.
+        """
+        for label, owner, schedule in (
+                [("Meeting room", room.room_name, room.events_schedule) for room in self.meeting_rooms_list]
+                + [("Office", room.room_name, room.events_schedule) for room in self.office_rooms_list]
+                + [("Employee", employee.employee_id, employee.events_schedule) for employee in self.employees_list]):
+            logger.debug("%s: %s", label, owner)
+            for event in schedule.events:
+                if event is not None:
+                    logger.debug("%s  -  %s", event.start_time, event.end_time)
+
+    def occupancy_grid(self, time_now_start, timestep, number_of_timesteps=None):
+        """
+        * Rasterise every office and meeting room schedule onto a time grid. The
+        * grid holds the occupied flags and head-counts both CSV writers are built from.
+        *
+        * @param time_now_start: datetime object representing the first timestamp
+        * @param timestep: timedelta between timestamps
+        * @param number_of_timesteps: number of timestamps in the grid, None to end the grid at 23:00
+        *                             (73 timestamps of 15 minutes from 05:00)
+        * @return: OccupancyGrid instance
+        """
+        if number_of_timesteps is None:
+            number_of_timesteps = (datetime(2010, 1, 1, 23, 00, 00) - time_now_start) // timestep + 1
+        return OccupancyGrid(self.office_rooms_list, self.meeting_rooms_list, time_now_start, timestep,
+                             number_of_timesteps)
+
+    def day_result(self):
         """
-        * Produce a CSV file where each row corresponds to a timestamp and columns
+        * Collect the result of the last simulated day without going through the output files.
+        *
+        * @return: DayResult with the occupancy grid, the meeting table (room, start, duration,
+        *          head-count, day) read from the meeting room schedules and the cancelled meetings
+        """
+        return DayResult.from_rooms(self.simulation_day_index, self.grid, self.meeting_rooms_list,
+                                    self.cancelled_meetings.get("cancelled", []),
+                                    None if self.stats is None else self.stats.as_dict())
+
+    def optimization_output_file(self, filename, time_now_start, grid=None):
+        """
+        * Produce a file where each row corresponds to a timestamp and columns
         * contain number of people present in each office and meeting room. The file
         * includes a final section with maximum occupancy and estimated room costs.
+        * The format is set by the manager's writer.
         *
-        * @param filename: output CSV path
+        * @param filename: output path
         * @param time_now_start: datetime object representing the first timestamp
+        * @param grid: OccupancyGrid to write, built at the manager's timestep from time_now_start if omitted
+        """
+        if grid is None:
+            grid = self.occupancy_grid(time_now_start, timedelta(minutes=self.timestep_minutes))
+        self.writer.write_optimization(filename, grid)
+
+    def inference_output_file(self, filename, timestep, time_now_start, grid=None):
         """
-        with open(filename, 'w', newline='') as file:
-            writer = csv.writer(file)
-            # writer.writerow(["Room", "Time", "Occupied", "Occupancy", "Max_occupancy"])
-            header = ['Time']
-            for room in self.office_rooms_list:
-                header.append('Office')
-            for room in self.meeting_rooms_list:
-                header.append('Meeting room')
-            writer.writerow(header)
-            for i in range(0, 73):
-                occupancy_list = [time_now_start.strftime("%H:%M")]
-                time_now_end = time_now_start + timedelta(minutes=1)
-                test_event = Event(time_now_start, time_now_end, None, None, None)
-                # for event in office.events_schedule.
-                for office in self.office_rooms_list:
-                    in_room = False
-                    person_count = 0
-                    for event in office.events_schedule.events:
-                        if event.is_contained(test_event):
-                            in_room = True
-                            if event.employees is None:
-                                in_room = False
-                            else:
-                                person_count = person_count + 1
-                    if in_room:
-                        occupancy_list.append(person_count)
-                    else:
-                        occupancy_list.append(0)
-                for meeting_room in self.meeting_rooms_list:
-                    in_room = False
-                    for event in meeting_room.events_schedule.events:
-                        if event.is_contained(test_event):
-                            in_room = True
-                            occupancy_list.append(len(event.employees))
-                    if not in_room:
-                        occupancy_list.append(0)
-                writer.writerow(occupancy_list)
-                time_now_start = time_now_start + timedelta(minutes=15)
-            max_occupancy_list = ['Maximum occupancy']
-            for room in self.office_rooms_list:
-                max_occupancy_list.append(room.max_office_occupancy)
-            for room in self.meeting_rooms_list:
-                max_occupancy_list.append(room.max_meeting_occupancy)
-            writer.writerow(max_occupancy_list)
-            room_cost_list = ['Room cost']
-            for room in self.office_rooms_list:
-                room_cost_list.append(95.39 * room.area)
-            for room in self.meeting_rooms_list:
-                room_cost_list.append(95.39 * room.area)
-            writer.writerow(room_cost_list)
-
-    def inference_output_file(self, filename, timestep, time_now_start):
-        """
-        * Produce a CSV file where each row is a single (room, time) observation intended
+        * Produce a file where each row is a single (room, time) observation intended
         * for inference/training of occupancy models. Each room/time is marked as occupied
         * (1) or not (0) with the observed occupancy and the room maximum occupancy.
+        * The format is set by the manager's writer.
         *
-        * @param filename: CSV output filename
+        * @param filename: output filename
         * @param timestep: timedelta between observations
         * @param time_now_start: datetime representing first observation time
+        * @param grid: OccupancyGrid to write, built from timestep and time_now_start if omitted
         """
-        with open(filename, 'w', newline='') as file:
-            writer = csv.writer(file)
-            writer.writerow(["Room", "Time", "Occupied", "Occupancy", "Max_occupancy"])
-            #
-            # Now go through all available times
-            #
-            for i in range(0, 73):
-                time_now_end = time_now_start + timedelta(seconds=1)
-                test_event = Event(time_now_start, time_now_end, None, None, None)
-                # for event in office.events_schedule.
-                for office in self.office_rooms_list:
-                    in_room = False
-                    person_count = 0
-                    for event in office.events_schedule.events:
-                        if event.is_contained(test_event):
-                            in_room = True
-                            person_count = person_count + 1
-                    if in_room:
-                        writer.writerow(["Office " + str(office.room_name), time_now_start.strftime("%H:%M"), 1, person_count,
-                                         office.max_office_occupancy])
-                    else:
-                        writer.writerow(
-                            ["Office " + str(office.room_name), time_now_start.strftime("%H:%M"), 0, 0,
-                             office.max_office_occupancy])
-
-                for meeting_room in self.meeting_rooms_list:
-                    in_room = False
-                    for event in meeting_room.events_schedule.events:
-                        if event.is_contained(test_event):
-                            in_room = True
-                            writer.writerow(
-                                ["Meeting room " + str(meeting_room.room_name), time_now_start.strftime("%H:%M"), 1,
-                                 len(event.employees), meeting_room.max_meeting_occupancy])
-                    if not in_room:
-                        writer.writerow(
-                            ["Meeting room " + str(meeting_room.room_name), time_now_start.strftime("%H:%M"), 0, 0,
-                             meeting_room.max_meeting_occupancy])
-                time_now_start = time_now_start + timestep
+        if grid is None:
+            grid = self.occupancy_grid(time_now_start, timestep)
+        self.writer.write_inference(filename, grid)
 
     def randint(self, a, b):
         """
         * Deterministic wrapper around sampling an integer uniformly in [a,b] using
-        * random.random() to make the behaviour explicit and testable.
+        * the manager's random number generator to make the behaviour explicit and testable.
         *
         * @param a: inclusive lower bound
         * @param b: inclusive upper bound
@@ -626,6 +1068,17 @@ class ScheduleManager:
         # b Upper bound (inclusive)
 
         # Sample a value from the distribution
-        U = random.random()
+        U = self.rng.random()
         X = a + math.floor((b - a + 1) * U)
-        return X
\ No newline at end of file
+        return X
+
+    def randint_n(self, a, b, n):
+        """
+        * Batched version of randint, sampling n integers uniformly in [a,b] with one draw.
+        *
+        * @param a: inclusive lower bound
+        * @param b: inclusive upper bound
+        * @param n: number of integers to sample
+        * @return: list of sampled integers
+        """
+        return (a + np.floor((b - a + 1) * self.rng.random(n)).astype(int)).tolist()
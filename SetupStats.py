@@ -0,0 +1,68 @@
+import time
+
+
+class SetupStats:
+    """
+    * SetupStats class - Instrumentation of one simulated day, recorded by a schedule manager
+    * created with collect_stats=True. Managers skip all of the recording when it is off.
+    *
+    * It records the wall time of each setup phase, the number of room and employee
+    * availability checks (clash and working-hours containment checks, including those run on
+    * every candidate when a replacement attendee is sampled), how many times
+    * each meeting was moved before it was booked, the number of attendee replacement
+    * attempts and the number of events booked, dropped and written to the occupancy grid.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, day=0):
+        """
+        * Constructor for objects of class SetupStats
+        *
+        * @param  day  index of the simulated day
+        """
+        self.day = day
+        self.phase_times = {}  # Wall time in seconds of each phase, in the order the phases ran
+        self.clash_checks = 0  # Clash tests of an event against a room's or employee's events while booking events
+        self.containment_checks = 0  # Calls of Schedule.is_contained while booking events
+        self.room_retries = []  # Number of new start times drawn for each meeting
+        self.employee_replacements = 0  # Number of attendee replacement attempts
+        self.events_booked = 0  # Meetings booked into their room
+        self.events_dropped = 0  # Meetings given up or cancelled
+        self.events_written = 0  # Room events (meetings and office periods) rasterised for the output files
+
+    def time_phase(self, phase, method, *args):
+        """
+        * Run a phase and add its wall time to phase_times
+        *
+        * @param  phase  the name of the phase
+        * @param  method  the phase method
+        * @param  args  arguments of the phase method
+        * @return    the value returned by the phase method
+        """
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self.phase_times[phase] = self.phase_times.get(phase, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        """
+        * Export the statistics of the day as a JSON serialisable dictionary
+        *
+        * @return    dictionary of the statistics
+        """
+        return {
+            'day': self.day,
+            'phase_times': dict(self.phase_times),
+            'setup_time': sum(self.phase_times.values()),
+            'clash_checks': self.clash_checks,
+            'containment_checks': self.containment_checks,
+            'room_retries': sum(self.room_retries),
+            'max_room_retries': max(self.room_retries, default=0),
+            'employee_replacements': self.employee_replacements,
+            'events_booked': self.events_booked,
+            'events_dropped': self.events_dropped,
+            'events_written': self.events_written,
+        }
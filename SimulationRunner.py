@@ -0,0 +1,135 @@
+from ScheduleManager import ScheduleManager
+from StatisticsSink import StatisticsSink
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import os
+
+# Statistics sink of this process for each statistics directory, kept open across the jobs a worker runs
+_worker_statistics = {}
+
+
+def worker_statistics(statistics_dir):
+    """
+    * Get this process's statistics sink for a directory, writing to a shard named after the process
+    *
+    * @param statistics_dir: directory of the statistics files
+    * @return: StatisticsSink
+    """
+    if statistics_dir not in _worker_statistics:
+        _worker_statistics[statistics_dir] = StatisticsSink(statistics_dir, shard='worker-' + str(os.getpid()))
+    return _worker_statistics[statistics_dir]
+
+
+def simulate_day(building, manager_class, experiment, day, seed, output_dir=None, statistics_dir=None):
+    """
+    * Simulate a single (experiment, day) job. This is a module level function so that it
+    * can be sent to a worker process.
+    *
+    * The building is rebuilt from its description so no state is shared between jobs,
+    * and the schedule manager draws every random number from a generator seeded with the job's own seed.
+    *
+    * @param building: Building describing the rooms, employees and PMFs
+    * @param manager_class: schedule manager class used to simulate the day
+    * @param experiment: index of the experiment
+    * @param day: index of the day within the experiment
+    * @param seed: integer seed for the job
+    * @param output_dir: directory for the job's CSV files, None to keep the results in memory only
+    * @param statistics_dir: directory for the true statistics and cancel rates of the cancellation model,
+    *                        written to this worker's shard, None to not write them
+    * @return: DayResult with the occupancy grid, meeting table and cancelled meetings (if any) of the day
+    """
+    office_rooms_list, meeting_rooms_list, employees_list = building.build()
+    if statistics_dir is None:
+        manager = manager_class(office_rooms_list, meeting_rooms_list, employees_list, seed=seed)
+        # Without a shard the cancellation model would append to the shared default statistics files
+        # from every worker at once
+        manager.write_statistics = False
+    else:
+        statistics = worker_statistics(statistics_dir)
+        statistics.key = [experiment, day]
+        manager = manager_class(office_rooms_list, meeting_rooms_list, employees_list, seed=seed,
+                                statistics=statistics)
+
+    filename_inference = None
+    filename_opt = None
+    if output_dir is not None:
+        experiment_dir = os.path.join(output_dir, 'Experiment_' + str(experiment))
+        os.makedirs(experiment_dir, exist_ok=True)
+        # Same layout as Occupancy_Generator.ipynb, office_Num{day}.csv holds the full occupancy table
+        filename_inference = os.path.join(experiment_dir, 'Opt_office_Num' + str(day) + '.csv')
+        filename_opt = os.path.join(experiment_dir, 'office_Num' + str(day) + '.csv')
+
+    result = manager.run_day(filename_inference, filename_opt, simulation_day_index=day)
+    if statistics_dir is not None:
+        statistics.flush()
+    result.experiment = experiment
+    result.seed = seed
+    return result
+
+
+class SimulationRunner:
+    """
+    * SimulationRunner class - Runs independent (experiment, day) simulations of a building
+    * across a pool of worker processes.
+    *
+    * Every job gets a seed derived from the runner seed, the experiment and the day, so the
+    * results do not depend on the number of workers or on the order in which jobs finish.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, building, manager_class=ScheduleManager, seed=0, max_workers=None):
+        """
+        * Constructor for objects of class SimulationRunner
+        *
+        * @param building: Building describing the rooms, employees and PMFs
+        * @param manager_class: ScheduleManager or ScheduleManager_cancel.ScheduleManager
+        * @param seed: integer seed the per-job seeds are derived from
+        * @param max_workers: number of worker processes, None for one per CPU and 1 to run in this process
+        """
+        self.building = building
+        self.manager_class = manager_class
+        self.seed = seed
+        self.max_workers = max_workers
+
+    def job_seed(self, experiment, day):
+        """
+        * Derive the seed of an (experiment, day) job from the runner seed
+        *
+        * @param experiment: index of the experiment
+        * @param day: index of the day
+        * @return: integer seed
+        """
+        return int(np.random.SeedSequence([self.seed, experiment, day]).generate_state(1)[0])
+
+    def run(self, experiments, days, output_dir=None, statistics_dir=None):
+        """
+        * Simulate every day of every experiment
+        *
+        * @param experiments: number of experiments, numbered from 1 as in the notebooks
+        * @param days: number of days per experiment, numbered from 1
+        * @param output_dir: directory for per-job CSV files (output_dir/Experiment_{y}/...),
+        *                    None to keep the results in memory only
+        * @param statistics_dir: directory for the statistics files of the cancellation model, each worker
+        *                        writes a shard and the shards are merged in (experiment, day) order at the end,
+        *                        None to not write them
+        * @return: list of DayResult objects ordered by experiment then day
+        """
+        jobs = [(experiment, day, self.job_seed(experiment, day))
+                for experiment in range(1, experiments + 1) for day in range(1, days + 1)]
+        if self.max_workers == 1:
+            results = [simulate_day(self.building, self.manager_class, experiment, day, seed, output_dir,
+                                    statistics_dir)
+                       for experiment, day, seed in jobs]
+            if statistics_dir in _worker_statistics:
+                _worker_statistics.pop(statistics_dir).close()
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [executor.submit(simulate_day, self.building, self.manager_class, experiment, day, seed,
+                                           output_dir, statistics_dir)
+                           for experiment, day, seed in jobs]
+                results = [future.result() for future in futures]
+        if statistics_dir is not None:
+            StatisticsSink.merge(statistics_dir)
+        return results
@@ -0,0 +1,103 @@
+import glob
+import json
+import os
+
+
+class StatisticsSink:
+    """
+    * StatisticsSink class - Streams the per-day statistics of a run to JSON-lines files,
+    * one compact JSON record per line, keeping each file open for the whole run.
+    *
+    * Each stream is written to {directory}/{stream}.json, e.g. num_of_meetings.json,
+    * num_of_people.json, duration_of_meetings_min.json and cancel_rate_summary.json.
+    *
+    * Parallel workers each write their own shard, {directory}/{stream}.{shard}.json, where
+    * every line also carries the key of the job (e.g. [experiment, day]) that wrote it.
+    * merge() then appends the records of all shards to the stream files in key order,
+    * so the merged files are the same whatever the number of workers.
+    *
+    * @author Dr. James Andrews
+    * @version 0.1.0
+    * @date 18/10/2026
+    """
+    def __init__(self, directory='Data', shard=None):
+        """
+        * Constructor for objects of class StatisticsSink, files are opened on their first record
+        *
+        * @param  directory  the directory of the statistics files, created if missing
+        * @param  shard  name of this worker's shard, None to append to the stream files directly
+        """
+        self.directory = directory
+        self.shard = shard
+        self.key = None  # Key of the job whose records are being written, stored with every shard record
+        self.files = {}
+
+    def path(self, stream):
+        """
+        * Gets the path of the file the sink writes a stream to
+        *
+        * @param  stream  the name of the stream
+        * @return    the file path
+        """
+        if self.shard is None:
+            return os.path.join(self.directory, stream + '.json')
+        return os.path.join(self.directory, stream + '.' + str(self.shard) + '.json')
+
+    def write(self, stream, record):
+        """
+        * Append one record to a stream
+        *
+        * @param  stream  the name of the stream, e.g. "num_of_meetings"
+        * @param  record  JSON serialisable record
+        """
+        file = self.files.get(stream)
+        if file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            file = self.files[stream] = open(self.path(stream), 'a')
+        if self.shard is not None:
+            record = [self.key, record]
+        file.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+    def flush(self):
+        """
+        * Flush the records written so far to the files
+        """
+        for file in self.files.values():
+            file.flush()
+
+    def close(self):
+        """
+        * Close every file of the sink
+        """
+        for file in self.files.values():
+            file.close()
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def merge(directory='Data'):
+        """
+        * Append the records of every shard in a directory to their stream files in key order,
+        * then remove the shards. Records with equal keys keep their order within the shard.
+        *
+        * @param  directory  the directory of the statistics files
+        """
+        shards = {}
+        for path in sorted(glob.glob(os.path.join(glob.escape(directory), '*.*.json'))):
+            stream = os.path.basename(path).split('.')[0]
+            shards.setdefault(stream, []).append(path)
+        for stream, paths in shards.items():
+            records = []
+            for path in paths:
+                with open(path) as file:
+                    records.extend(json.loads(line) for line in file)
+            records.sort(key=lambda key_and_record: (key_and_record[0] is not None, key_and_record[0]))
+            with open(os.path.join(directory, stream + '.json'), 'a') as file:
+                file.writelines(json.dumps(record, separators=(',', ':')) + '\n' for _, record in records)
+            for path in paths:
+                os.remove(path)
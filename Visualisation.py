@@ -0,0 +1,174 @@
+"""
+* Visualisation.py - Plotting of simulated schedules. Kept apart from the schedule managers, which
+* only import it when a chart is drawn, so that simulation workers and headless runs never pay
+* for importing matplotlib.
+*
+* gantt_chart draws every bar of a chart in one PolyCollection from integer minute arrays, so
+* charts of whole buildings render in well under a second. Figures that are saved rather than
+* shown are created without pyplot and need no display.
+"""
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+import numpy as np
+
+MINUTES_IN_DAY = 24 * 60
+# Colours of the event types, other types take the spare colours in turn
+EVENT_COLOURS = {'Meeting': 'tab:blue', 'Normal working': 'tab:green'}
+# Largest number of row labels drawn, larger charts label every n-th row
+MAX_ROW_LABELS = 50
+SPARE_COLOURS = ('tab:orange', 'tab:red', 'tab:purple', 'tab:brown', 'tab:pink', 'tab:gray', 'tab:olive', 'tab:cyan')
+
+
+def to_minutes(time_str):
+    """
+    * Convert a time string in the format 'HH:MM' to minutes
+    """
+    hours, minutes = map(int, time_str.split(':'))
+    return hours * 60 + minutes
+
+
+def to_time(minutes):
+    """
+    * Convert minutes to a time string in the format 'HH:MM'
+    """
+    hours, minutes = divmod(minutes, 60)
+    return f'{hours:02d}:{minutes:02d}'
+
+
+def schedule_segments(schedules):
+    """
+    * Collect the events of a list of schedules as integer minute arrays, one row per schedule
+    *
+    * @param schedules: list of Schedule objects
+    * @return: (rows, starts, ends, event_types) arrays, the times in minutes from midnight
+    """
+    rows, starts, ends, event_types = [], [], [], []
+    for row, schedule in enumerate(schedules):
+        for event in schedule.events:
+            start = event.start_minute % MINUTES_IN_DAY
+            rows.append(row)
+            starts.append(start)
+            ends.append(start + event.end_minute - event.start_minute)
+            event_types.append(event.event_type)
+    return (np.asarray(rows, dtype=int), np.asarray(starts, dtype=int), np.asarray(ends, dtype=int),
+            np.asarray(event_types, dtype=object))
+
+
+def gantt_chart(labels, rows, starts, ends, event_types=None, groups=None, top_n=None, path=None, show=False,
+                title='Daily Schedule', ylabel='', start_minute=300, end_minute=1380, dpi=100):
+    """
+    * Draw a Gantt chart of many rows as a single PolyCollection, coloured by event type
+    *
+    * With groups, the rows of each group (e.g. the employees of an office) share one band of the
+    * chart, each drawn as a thin lane of it. With top_n, only the top_n busiest rows, or groups,
+    * are drawn, busiest at the top.
+    *
+    * @param labels: label of each row
+    * @param rows: row of each bar
+    * @param starts: start of each bar in minutes from midnight
+    * @param ends: end of each bar in minutes from midnight
+    * @param event_types: event type of each bar, all bars are drawn in one colour if omitted
+    * @param groups: group label of each row, one band per row if omitted
+    * @param top_n: the number of busiest bands drawn, all of them if omitted
+    * @param path: file the chart is saved to, the format taken from its extension (.png, .svg, ...)
+    * @param show: show the chart with pyplot, otherwise the figure is created without pyplot
+    * @param title: the chart title
+    * @param ylabel: the y-axis label
+    * @param start_minute: the first minute of the day shown
+    * @param end_minute: the last minute of the day shown
+    * @param dpi: resolution of raster output files
+    * @return: the matplotlib Figure
+    """
+    rows, starts, ends = np.asarray(rows, dtype=int), np.asarray(starts, dtype=int), np.asarray(ends, dtype=int)
+    if groups is None:
+        # Every row is its own band, in the order given
+        band_labels, row_bands = list(labels), np.arange(len(labels))
+        band_height = 0.4
+    else:
+        # One band per group, in the order the groups first appear
+        band_indices = {}
+        row_bands = np.array([band_indices.setdefault(group, len(band_indices)) for group in groups], dtype=int)
+        band_labels = list(band_indices)
+        band_height = 0.8
+
+    # Order the bands, busiest first when only the top_n are drawn
+    busy_minutes = np.bincount(row_bands[rows], weights=ends - starts, minlength=len(band_labels))
+    if top_n is None:
+        band_order = np.arange(len(band_labels))
+    else:
+        band_order = np.argsort(-busy_minutes, kind='stable')[:top_n][::-1]
+    band_position = np.full(len(band_labels), -1)
+    band_position[band_order] = np.arange(len(band_order))
+
+    # Lane of each row inside its band
+    lanes = np.zeros(len(labels), dtype=int)
+    lanes_in_band = np.zeros(len(band_labels), dtype=int)
+    for row, band in enumerate(row_bands):
+        lanes[row] = lanes_in_band[band]
+        lanes_in_band[band] += 1
+    lane_height = band_height / np.maximum(lanes_in_band[row_bands], 1)
+    row_bottoms = band_position[row_bands] + 1 - band_height / 2 + lanes * lane_height
+
+    drawn = band_position[row_bands[rows]] >= 0
+    bottoms, heights = row_bottoms[rows[drawn]], lane_height[rows[drawn]]
+    left, right = starts[drawn], ends[drawn]
+    vertices = np.stack([np.stack([left, bottoms], axis=1), np.stack([right, bottoms], axis=1),
+                         np.stack([right, bottoms + heights], axis=1), np.stack([left, bottoms + heights], axis=1)],
+                        axis=1)
+
+    if event_types is None:
+        colours, legend = 'tab:blue', []
+    else:
+        event_types = np.asarray(event_types, dtype=object)[drawn]
+        type_names, type_indices = np.unique(event_types.astype(str), return_inverse=True)
+        spare_types = [name for name in type_names if name not in EVENT_COLOURS]
+        type_colours = [EVENT_COLOURS.get(name) or SPARE_COLOURS[spare_types.index(name) % len(SPARE_COLOURS)]
+                        for name in type_names]
+        colours = [type_colours[index] for index in type_indices]
+        legend = [Patch(facecolor=colour, label=name) for name, colour in zip(type_names, type_colours)]
+
+    figure_size = (10, 1.5 + 0.25 * min(max(len(band_order), 6), MAX_ROW_LABELS))
+    if show:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=figure_size)
+    else:
+        fig = Figure(figsize=figure_size)
+    ax = fig.add_subplot()
+    ax.add_collection(PolyCollection(vertices, facecolors=colours, edgecolors='none'))
+
+    ax.set_ylim(0.5, max(len(band_order), 1) + 0.5)
+    labelled = range(0, len(band_order), max(1, -(-len(band_order) // MAX_ROW_LABELS)))
+    ax.set_yticks([position + 1 for position in labelled])
+    ax.set_yticklabels([str(band_labels[band_order[position]]) for position in labelled])
+    ax.set_xlim(start_minute, end_minute)
+    ax.set_xticks(range(start_minute, end_minute, 60))
+    ax.set_xticklabels([to_time(minutes) for minutes in range(start_minute, end_minute, 60)])
+    ax.set_xlabel('Time')
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    if legend:
+        ax.legend(handles=legend, loc='upper right', fontsize='small')
+    fig.tight_layout()
+
+    if path is not None:
+        fig.savefig(path, dpi=dpi)
+    if show:
+        plt.show()
+    return fig
+
+
+def gantt(tasks):
+    """
+    * Render a simple Gantt-like chart using matplotlib. `tasks` is expected to be
+    * a dict mapping labels -> list of (start_str, end_str) tuples in HH:MM format.
+    *
+    * @param tasks: dictionary of the bars of each label
+    """
+    rows, starts, ends = [], [], []
+    for row, segments in enumerate(tasks.values()):
+        for start, end in segments:
+            rows.append(row)
+            starts.append(to_minutes(start))
+            ends.append(to_minutes(end))
+    gantt_chart(list(tasks.keys()), rows, starts, ends, show=True, ylabel='Employee')
@@ -0,0 +1,232 @@
+"""
+* benchmark.py - Times ScheduleManager.setup phase by phase across building sizes and PMF intensities
+* and writes the results as JSON, so that runs from different commits can be compared.
+*
+* Usage:
+*     python benchmark.py --offices 15 60 --meeting-rooms 3 12 --intensity 1 2 --days 10 --output benchmark.json
+*
+* Every day is simulated with its own seed, derived from --seed and the day, so two runs of the
+* same sweep simulate the same days. The output files are written to a temporary directory so
+* that the export phase includes the CSV writing. Phase times and the availability check and retry
+* counts come from the SetupStats the managers collect with collect_stats=True.
+*
+* The import time of ScheduleManager is measured in fresh interpreters and checked against
+* --import-budget, since every worker process pays it. The benchmark exits with status 1 when the
+* import is over budget, and --import-only runs just this check.
+*
+* @author Dr. James Andrews
+* @version 0.1.0
+* @date 18/10/2026
+"""
+from Building import Building
+from ConflictPolicy import RescheduleLaterPolicy, ShrinkPolicy
+from PMF import PMF
+from ScheduleManager import ScheduleManager
+from ScheduleManager_cancel import ScheduleManager as CancelScheduleManager
+from StatisticsSink import StatisticsSink
+from datetime import datetime
+import argparse
+import itertools
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Setup phases in the order setup runs them, the cancellation model also saves its statistics
+PHASES = ('sample_meetings', 'draft_events', 'resolve_clashes', 'fill_offices', 'sort_schedules', 'export')
+# Manager class, its extra constructor arguments and its phases
+MANAGERS = {
+    'default': (ScheduleManager, {}, PHASES),
+    'cancel': (CancelScheduleManager, {}, PHASES + ('save_statistics',)),
+    'reschedule-later': (ScheduleManager, {'conflict_policy': RescheduleLaterPolicy()}, PHASES),
+    'shrink': (ScheduleManager, {'conflict_policy': ShrinkPolicy()}, PHASES),
+}
+# Modules whose import time is checked, the entry points of the simulation workers
+IMPORT_MODULES = ('ScheduleManager', 'ScheduleManager_cancel', 'SimulationRunner')
+# Largest import time in seconds allowed for each of them, also checked by test_import_time.py
+IMPORT_BUDGET = 0.5
+# SetupStats counts reported per day
+COUNTS = ('clash_checks', 'containment_checks', 'room_retries', 'employee_replacements', 'events_booked',
+          'events_dropped', 'events_written')
+
+
+def benchmark_building(number_of_offices, number_of_meeting_rooms, number_of_employees, intensity):
+    """
+    * Building with the PMFs of PMF mode 1 in Occupancy_Generator.ipynb, the number of meetings
+    * per room is multiplied by the intensity
+    *
+    * @param number_of_offices: the number of offices
+    * @param number_of_meeting_rooms: the number of meeting rooms
+    * @param number_of_employees: the number of employees
+    * @param intensity: multiplier of the number of meetings in each meeting room
+    * @return: Building
+    """
+    meeting_durations_pmf = PMF([30, 60, 90, 120], [0.2, 0.6, 0.1, 0.1])
+    number_of_employees_pmf = PMF([2, 3, 4, 5], [0.5, 0.15, 0.05, 0.3])
+    number_of_meetings_pmf = PMF([int(round(intensity * meetings)) for meetings in [2, 3, 4, 5]],
+                                 [0.25, 0.25, 0.25, 0.25])
+    return Building(number_of_offices, number_of_meeting_rooms, number_of_employees,
+                    meeting_durations_pmf, number_of_employees_pmf, number_of_meetings_pmf)
+
+
+def summary(times):
+    """
+    * Summarise a list of wall times in seconds
+    *
+    * @param times: list of wall times
+    * @return: dictionary with the total, mean, median, min and max
+    """
+    times = np.asarray(times, dtype=float)
+    if times.size == 0:
+        return {'total': 0.0, 'mean': 0.0, 'median': 0.0, 'min': 0.0, 'max': 0.0}
+    return {'total': float(times.sum()), 'mean': float(times.mean()), 'median': float(np.median(times)),
+            'min': float(times.min()), 'max': float(times.max())}
+
+
+def run_case(manager_name, number_of_offices, number_of_meeting_rooms, number_of_employees, intensity, days,
+             seed, output_dir, warmup=1, timestep_minutes=15):
+    """
+    * Time the setup of one building configuration over several days
+    *
+    * @param manager_name: a key of MANAGERS, e.g. 'default' or 'cancel'
+    * @param number_of_offices: the number of offices
+    * @param number_of_meeting_rooms: the number of meeting rooms
+    * @param number_of_employees: the number of employees
+    * @param intensity: multiplier of the number of meetings in each meeting room
+    * @param days: the number of timed days
+    * @param seed: integer seed the seed of each day is derived from
+    * @param output_dir: directory for the output files
+    * @param warmup: the number of untimed days simulated first
+    * @param timestep_minutes: minutes between the timesteps of the output files
+    * @return: dictionary with the configuration, the setup and phase timings and the SetupStats counts per day
+    """
+    manager_class, manager_kwargs, phases = MANAGERS[manager_name]
+    building = benchmark_building(number_of_offices, number_of_meeting_rooms, number_of_employees, intensity)
+    setup_times = []
+    phase_times = {phase: [] for phase in phases}
+    counts = {count: 0 for count in COUNTS}
+    number_of_meetings = 0
+    with StatisticsSink(os.path.join(output_dir, 'statistics')) as statistics:
+        for day in range(-warmup, days):
+            kwargs = dict(manager_kwargs, statistics=statistics) if 'save_statistics' in phases else manager_kwargs
+            manager = manager_class(*building.build(), seed=[seed, day + warmup], collect_stats=True,
+                                    timestep_minutes=timestep_minutes, **kwargs)
+            filename_inference = os.path.join(output_dir, 'Opt_office_Num' + str(day) + '.csv')
+            filename_opt = os.path.join(output_dir, 'office_Num' + str(day) + '.csv')
+            start = time.perf_counter()
+            manager.setup(filename_inference, filename_opt, simulation_day_index=day)
+            elapsed = time.perf_counter() - start
+            if day < 0:
+                continue
+            setup_times.append(elapsed)
+            stats = manager.stats.as_dict()
+            for phase in phases:
+                phase_times[phase].append(stats['phase_times'].get(phase, 0.0))
+            for count in COUNTS:
+                counts[count] += stats[count]
+            number_of_meetings += sum(room.events_schedule.number_of_meetings()
+                                      for room in manager.meeting_rooms_list)
+    return {
+        'manager': manager_name,
+        'offices': number_of_offices,
+        'meeting_rooms': number_of_meeting_rooms,
+        'employees': number_of_employees,
+        'intensity': intensity,
+        'timestep_minutes': timestep_minutes,
+        'days': days,
+        'meetings_per_day': number_of_meetings / days if days else 0.0,
+        'setup': summary(setup_times),
+        'phases': {phase: summary(times) for phase, times in phase_times.items()},
+        'counts_per_day': {count: total / days if days else 0.0 for count, total in counts.items()},
+    }
+
+
+def import_time(module, repeats=5):
+    """
+    * Measure the time to import a module in a fresh interpreter, taken from the cumulative
+    * time python -X importtime reports for the module, so interpreter startup is not included
+    *
+    * @param module: the module name
+    * @param repeats: the number of interpreters started, the fastest import is kept
+    * @return: the import time in seconds
+    """
+    times = []
+    for _ in range(repeats):
+        stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stderr
+        match = re.search(r'^import time:\s+\d+ \|\s+(\d+) \| ' + re.escape(module) + '$', stderr, re.MULTILINE)
+        times.append(int(match.group(1)) / 1e6)
+    return min(times)
+
+
+def environment():
+    """
+    * Describe the machine and the code version the benchmark ran on
+    *
+    * @return: dictionary with the date, Python, NumPy, platform and git commit
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'date': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'platform': platform.platform(), 'commit': commit}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time ScheduleManager.setup phase by phase across building sizes.")
+    parser.add_argument('--managers', nargs='+', choices=sorted(MANAGERS), default=['default', 'cancel'])
+    parser.add_argument('--offices', nargs='+', type=int, default=[15, 60])
+    parser.add_argument('--meeting-rooms', nargs='+', type=int, default=[3, 12])
+    parser.add_argument('--employees', nargs='+', type=int, default=None,
+                        help="numbers of employees, one per office if omitted")
+    parser.add_argument('--intensity', nargs='+', type=float, default=[1.0],
+                        help="multipliers of the number of meetings per room")
+    parser.add_argument('--timesteps', nargs='+', type=int, default=[15],
+                        help="minutes between the timesteps of the output files")
+    parser.add_argument('--days', type=int, default=10, help="timed days per configuration")
+    parser.add_argument('--warmup', type=int, default=1, help="untimed days simulated before the timed days")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark.json', help="JSON results file")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_BUDGET,
+                        help="largest import time in seconds allowed for each worker module")
+    parser.add_argument('--import-only', action='store_true', help="only check the import times")
+    args = parser.parse_args(argv)
+
+    import_times = {module: import_time(module) for module in IMPORT_MODULES}
+    over_budget = [module for module, seconds in import_times.items() if seconds > args.import_budget]
+    for module, seconds in import_times.items():
+        print("import {module:22s} {seconds:.4f}s{flag}".format(
+            module=module, seconds=seconds, flag=" over the budget of {:g}s".format(args.import_budget)
+            if module in over_budget else ""))
+    if args.import_only:
+        return 1 if over_budget else 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for manager_name, offices, meeting_rooms, intensity, timestep_minutes in itertools.product(
+                args.managers, args.offices, args.meeting_rooms, args.intensity, args.timesteps):
+            for employees in (args.employees or [offices]):
+                result = run_case(manager_name, offices, meeting_rooms, employees, intensity, args.days, args.seed,
+                                  output_dir, args.warmup, timestep_minutes)
+                results.append(result)
+                print("{manager:16s} offices={offices:<4d} meeting_rooms={meeting_rooms:<4d} employees={employees:<4d} "
+                      "intensity={intensity:<4g} timestep={timestep_minutes:<2d} setup={mean:.4f}s ".format(mean=result['setup']['mean'], **result)
+                      + " ".join(phase + "=" + format(times['mean'], '.4f') for phase, times in result['phases'].items()))
+
+    with open(args.output, 'w') as file:
+        json.dump({'environment': environment(), 'arguments': vars(args), 'import_times': import_times,
+                   'results': results}, file, indent=2)
+    print("Results written to " + args.output)
+    return 1 if over_budget else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""
+* test_benchmark.py - The setup benchmark as pytest-benchmark tests. Each test times run_case on a
+* small building, so pytest-benchmark can compare setup times between commits, and checks the
+* phases and SetupStats counts it reports.
+*
+* Usage:
+*     python -m pytest test_benchmark.py --benchmark-autosave
+*
+* The tests are skipped when pytest-benchmark is not installed.
+*
+* @author Dr. James Andrews
+* @version 0.1.0
+* @date 18/10/2026
+"""
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import benchmark as setup_benchmark
+
+
+@pytest.mark.parametrize('manager_name', sorted(setup_benchmark.MANAGERS))
+def test_run_case(benchmark, manager_name, tmp_path):
+    result = benchmark.pedantic(setup_benchmark.run_case,
+                                args=(manager_name, 15, 3, 15, 1.0, 2, 0, str(tmp_path)),
+                                kwargs={'warmup': 0}, rounds=1, iterations=1)
+    assert tuple(result['phases']) == setup_benchmark.MANAGERS[manager_name][2]
+    assert tuple(result['counts_per_day']) == setup_benchmark.COUNTS
+    assert result['days'] == 2
+    assert result['setup']['total'] > 0
+    assert result['counts_per_day']['events_booked'] > 0
+    assert result['counts_per_day']['clash_checks'] > 0
+    assert result['counts_per_day']['events_written'] > 0
@@ -0,0 +1,32 @@
+"""
+* test_import_time.py - Import-time budget of the modules every simulation worker imports. Each
+* module must import in fresh interpreters within benchmark.IMPORT_BUDGET seconds and must not
+* pull in matplotlib, which only Visualisation needs.
+*
+* Usage:
+*     python -m pytest test_import_time.py
+*
+* @author Dr. James Andrews
+* @version 0.1.0
+* @date 18/10/2026
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize('module', benchmark.IMPORT_MODULES)
+def test_import_time_within_budget(module):
+    assert benchmark.import_time(module) < benchmark.IMPORT_BUDGET
+
+
+@pytest.mark.parametrize('module', benchmark.IMPORT_MODULES)
+def test_import_does_not_load_matplotlib(module):
+    loaded = subprocess.run([sys.executable, '-c', 'import sys, ' + module + "; print('matplotlib' in sys.modules)"],
+                            capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    assert loaded == 'False'
@@ -0,0 +1,36 @@
+"""
+* test_simulation_runner.py - Parallel runs of the cancellation model must not share any
+* statistics files: without a statistics directory nothing is written, neither to the working
+* directory nor to the default statistics directory.
+*
+* Usage:
+*     python -m pytest test_simulation_runner.py
+*
+* @author Dr. James Andrews
+* @version 0.1.0
+* @date 18/10/2026
+"""
+import os
+
+import ScheduleManager
+from ScheduleManager_cancel import ScheduleManager as CancelScheduleManager
+from SimulationRunner import SimulationRunner
+from benchmark import benchmark_building
+
+
+def statistics_files():
+    directory = ScheduleManager.DEFAULT_STATISTICS_DIR
+    if not os.path.isdir(directory):
+        return None
+    return {name: os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)}
+
+
+def test_parallel_cancel_run_writes_nothing_without_statistics_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    before = statistics_files()
+    results = SimulationRunner(benchmark_building(10, 2, 10, 3), manager_class=CancelScheduleManager, seed=1,
+                               max_workers=2).run(experiments=2, days=2)
+    assert len(results) == 4
+    assert sum(len(result.cancelled) for result in results) > 0
+    assert os.listdir(tmp_path) == []
+    assert statistics_files() == before